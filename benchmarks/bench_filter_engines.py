@@ -0,0 +1,39 @@
+""" Throughput of the `tf` (lfilter) and `sos` (sosfilt) engines versus filter order
+
+Run: python benchmarks/bench_filter_engines.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from signal_processing import filter_signal
+
+N_SAMPLES = 200_000
+ORDERS = [2, 4, 8, 16, 32, 64]
+
+# Random stable design with `order` poles & zeros in conjugate pairs
+def random_design(order, rng):
+    half = order // 2
+    zeros = rng.uniform(0.5, 1.0, half) * np.exp(1j * rng.uniform(0, np.pi, half))
+    poles = rng.uniform(0.8, 0.99, half) * np.exp(1j * rng.uniform(0, np.pi, half))
+    return list(zeros) + list(np.conj(zeros)), list(poles) + list(np.conj(poles))
+
+def main():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal(N_SAMPLES)
+    print(f"{'order':>6} {'engine':>7} {'Msamples/s':>11} {'finite':>7} {'max |tf - sos|':>15}")
+    for order in ORDERS:
+        z, p = random_design(order, rng)
+        outputs = {}
+        for engine in ("tf", "sos"):
+            start = time.perf_counter()
+            outputs[engine] = filter_signal(x, z, p, engine=engine)
+            elapsed = time.perf_counter() - start
+            finite = np.all(np.isfinite(outputs[engine]))
+            print(f"{order:>6} {engine:>7} {N_SAMPLES / elapsed / 1e6:>11.2f} {str(finite):>7}", end="")
+            print(f" {np.nanmax(np.abs(outputs['tf'] - outputs['sos'])):>15.3g}" if engine == "sos" else "")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+""" Cost of updating the frequency response while one conjugate pole pair is dragged, versus filter order
+
+Compares recomputing the response over every root (`get_frequency_response`)
+with the cached `FrequencyResponse`, which only divides out & multiplies in the
+factors of the moved pair, & reports the largest difference between them.
+
+Run: python benchmarks/bench_frequency_response.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from signal_processing import FrequencyResponse, get_frequency_response
+
+ORDERS = [8, 32, 128, 512, 2048]
+N_STEPS = 200
+
+# Random stable design with `order` poles & zeros in conjugate pairs
+def random_design(order, rng):
+    half = order // 2
+    zeros = rng.uniform(0.5, 1.0, half) * np.exp(1j * rng.uniform(0, np.pi, half))
+    poles = rng.uniform(0.8, 0.99, half) * np.exp(1j * rng.uniform(0, np.pi, half))
+    return list(zeros) + list(np.conj(zeros)), list(poles) + list(np.conj(poles))
+
+# Designs of every step of a drag of the first pole pair along a circle
+def drag_steps(z, p):
+    half = len(p) // 2
+    for pole in 0.9 * np.exp(1j * np.linspace(0.1, 3.0, N_STEPS)):
+        p = list(p)
+        p[0], p[half] = pole, np.conj(pole)
+        yield z, p
+
+def main():
+    rng = np.random.default_rng(0)
+    print(f"{'order':>6} {'full (ms)':>10} {'cached (ms)':>12} {'max |dB diff|':>14} {'max |phase diff|':>17}")
+    for order in ORDERS:
+        z, p = random_design(order, rng)
+        steps = list(drag_steps(z, p))
+
+        start = time.perf_counter()
+        full = [get_frequency_response(z, p) for z, p in steps]
+        full_time = (time.perf_counter() - start) / N_STEPS * 1000
+
+        response = FrequencyResponse()
+        response.update(z, p)
+        start = time.perf_counter()
+        cached = [response.update(z, p) for z, p in steps]
+        cached_time = (time.perf_counter() - start) / N_STEPS * 1000
+
+        # High orders overflow the polynomials of `freqz_zpk`, only its finite values are compared
+        with np.errstate(invalid="ignore"):
+            magnitude = max(np.nanmax(np.abs(a[1] - b[1]), initial=0) for a, b in zip(full, cached))
+            phase = max(np.nanmax(np.abs(a[2] - b[2]), initial=0) for a, b in zip(full, cached))
+        print(f"{order:>6} {full_time:>10.3f} {cached_time:>12.3f} {magnitude:>14.3g} {phase:>17.3g}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+""" Frames per second of a scrolling Plotter window, as in the Apply Filter tab playback
+
+Compares the persistent blitted line of `Plotter.plot_signal` against clearing the
+axes & plotting a new line every frame.
+
+Run: QT_QPA_PLATFORM=offscreen python benchmarks/bench_plotter.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from PyQt5.QtWidgets import QApplication
+from plotter import Plotter
+from render_scheduler import scheduler
+
+N_FRAMES = 300
+RESOLUTION = 200
+
+# Previous behaviour: axes cleared, styled & a new line plotted every frame
+def plot_signal_cla(plotter, x, y):
+    plotter.axes.cla()
+    plotter.set_settings()
+    plotter.axes.plot(x, y, color="#64B5CD", linewidth=2.5, dash_joinstyle='round', dash_capstyle="round")
+    plotter.draw_idle()
+    plotter.blit()
+
+# Current behaviour: line data set & blitted, the render tick is run right away to draw every frame
+def plot_signal_set_data(plotter, x, y):
+    plotter.plot_signal(x, y)
+    scheduler.tick()
+
+def measure(app, plot_function):
+    plotter = Plotter(title="Filtered Signal", x_axis="time", y_axis="amplitude")
+    plotter.resize(800, 400)
+    plotter.show()
+    app.processEvents()
+
+    time_axis = np.arange(N_FRAMES + RESOLUTION) / 1000
+    signal = np.sin(2 * np.pi * 5 * time_axis)
+    start = time.perf_counter()
+    for curr in range(N_FRAMES):
+        plot_function(plotter, time_axis[curr:curr + RESOLUTION], signal[curr:curr + RESOLUTION])
+        app.processEvents()
+    elapsed = time.perf_counter() - start
+    plotter.close()
+    return N_FRAMES / elapsed
+
+def main():
+    app = QApplication(sys.argv)
+    print(f"cla + plot : {measure(app, plot_signal_cla):8.1f} fps")
+    print(f"set_data   : {measure(app, plot_signal_set_data):8.1f} fps")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+""" Memory of the loaded, filtered & windowed signal: Python lists versus NumPy arrays
+
+Run: python benchmarks/bench_signal_memory.py [n_samples]
+"""
+import os
+import sys
+import tempfile
+import tracemalloc
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from signal_processing import filter_signal
+
+Z = [0.9 + 0.2j, 0.9 - 0.2j]
+P = [0.5 + 0.5j, 0.5 - 0.5j]
+RESOLUTION = 200
+
+# Previous path: columns converted to lists, sliced as lists every tick
+def list_path(path):
+    frame = pd.read_csv(path)
+    original_signal = frame.iloc[:,1].values.tolist()
+    time = frame.iloc[:,0].values.tolist()
+    filtered_signal = filter_signal(original_signal, Z, P)
+    window = (time[:RESOLUTION], original_signal[:RESOLUTION], filtered_signal[:RESOLUTION])
+    return original_signal, time, filtered_signal, window
+
+# NumPy path of MainWindow: contiguous arrays, windows are views
+def array_path(path, dtype):
+    frame = pd.read_csv(path)
+    original_signal = np.ascontiguousarray(frame.iloc[:,1].to_numpy(dtype=dtype))
+    time = np.ascontiguousarray(frame.iloc[:,0].to_numpy(dtype=np.float64))
+    filtered_signal = np.real(filter_signal(original_signal, Z, P)).astype(dtype, copy=False)
+    window = (time[:RESOLUTION], original_signal[:RESOLUTION], filtered_signal[:RESOLUTION])
+    return original_signal, time, filtered_signal, window
+
+def measure(function, *args):
+    tracemalloc.start()
+    result = function(*args)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / 2**20, peak / 2**20
+
+def main():
+    n_samples = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    frame = pd.DataFrame({"x": np.arange(n_samples) / 1000, "y": np.random.default_rng(0).standard_normal(n_samples)})
+    path = os.path.join(tempfile.mkdtemp(), "signal.csv")
+    frame.to_csv(path, index=False)
+    print(f"{n_samples:,} samples {'held MB':>10} {'peak MB':>10}")
+    for name, function, args in [("lists", list_path, ()),
+                                 ("float64", array_path, (np.float64,)),
+                                 ("float32", array_path, (np.float32,))]:
+        held, peak = measure(function, path, *args)
+        print(f"{name:>17} {held:>10.1f} {peak:>10.1f}")
+    os.remove(path)
+
+if __name__ == '__main__':
+    main()
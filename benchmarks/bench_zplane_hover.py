@@ -0,0 +1,50 @@
+""" Cost of a mouse move over the Z plane versus the number of roots placed on it
+
+Compares the blitted crosshair of `Zplane.on_move` against a full redraw of the
+figure on every move.
+
+Run: QT_QPA_PLATFORM=offscreen python benchmarks/bench_zplane_hover.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from PyQt5.QtWidgets import QApplication
+from matplotlib.backend_bases import MouseEvent
+from zplane import Zplane
+from render_scheduler import scheduler
+
+N_MOVES = 200
+N_ROOTS = (0, 50, 200, 800)
+
+def measure(app, n_roots, full_redraw):
+    zplane = Zplane()
+    zplane.resize(600, 600)
+    zplane.show()
+    rng = np.random.default_rng(0)
+    for root in rng.uniform(-1, 1, n_roots) + 1j * rng.uniform(-1, 1, n_roots):
+        zplane.add_zero(root)
+    scheduler.tick()
+    app.processEvents()
+
+    points = zplane.axes.transData.transform(np.stack([np.linspace(-1, 1, N_MOVES), np.linspace(1, -1, N_MOVES)], axis=1))
+    start = time.perf_counter()
+    for x, y in points:
+        zplane.on_move(MouseEvent("motion_notify_event", zplane, x, y))
+        if full_redraw:
+            zplane.draw()
+        scheduler.tick()
+    elapsed = time.perf_counter() - start
+    zplane.close()
+    return elapsed / N_MOVES * 1000
+
+def main():
+    app = QApplication(sys.argv)
+    print("roots   full redraw   blitted crosshair   (ms per move)")
+    for n_roots in N_ROOTS:
+        print(f"{n_roots:5d}   {measure(app, n_roots, True):11.2f}   {measure(app, n_roots, False):17.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+""" Motion events coalesced by the Z plane while a root is dragged
+
+Sends motion events at the rate of a high polling rate mouse for one second and
+reports how many were processed (crosshair, dragged roots & response update)
+versus coalesced into a later event of the same frame.
+
+Run: QT_QPA_PLATFORM=offscreen python benchmarks/bench_zplane_motion.py [events_per_second]
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from PyQt5.QtWidgets import QApplication
+from matplotlib.backend_bases import MouseEvent
+from zplane import Zplane
+from signal_processing import get_frequency_response
+
+def main():
+    app = QApplication(sys.argv)
+    rate = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+
+    updates = []
+    def update_response(*args):
+        updates.append(get_frequency_response(zplane.get_zeros(), zplane.get_poles()))
+
+    zplane = Zplane(callback_function=update_response)
+    zplane.resize(600, 600)
+    zplane.show()
+    zplane.add_pole(0.5 + 0.5j, conjugate=True)
+    app.processEvents()
+
+    # Pick the pole, then move it along a circle
+    x, y = zplane.axes.transData.transform((0.5, 0.5))
+    zplane.on_press(MouseEvent("button_press_event", zplane, x, y, button=1))
+    updates.clear()
+
+    angles = np.linspace(np.pi / 4, 2 * np.pi, rate)
+    points = zplane.axes.transData.transform(np.stack([0.7 * np.cos(angles), 0.7 * np.sin(angles)], axis=1))
+    start = time.perf_counter()
+    for i, (x, y) in enumerate(points):
+        zplane.on_motion(MouseEvent("motion_notify_event", zplane, x, y))
+        while time.perf_counter() - start < (i + 1) / rate:
+            app.processEvents()
+    zplane.on_release(MouseEvent("button_release_event", zplane, x, y, button=1))
+    elapsed = time.perf_counter() - start
+
+    print(f"motion events  : {zplane.motion_received} in {elapsed:.2f} s")
+    print(f"processed      : {zplane.motion_processed}")
+    print(f"coalesced      : {zplane.coalesced_motion_events()}")
+    print(f"response calls : {len(updates)}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+""" Cost of adding, moving, reading back, hit-testing & deleting Z plane roots versus how many are placed
+
+Drawing is left to the render scheduler & is not measured, only the work done
+on the roots of every add, drag step & response update. Then compares loading a
+design root by root, root by root in a `transaction` & all its roots at once
+with `set_roots`, all updating the frequency response on every callback like the app does.
+
+Run: QT_QPA_PLATFORM=offscreen python benchmarks/bench_zplane_roots.py
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src"))
+from PyQt5.QtWidgets import QApplication
+from matplotlib.backend_bases import MouseEvent
+from zplane import Zplane
+from signal_processing import get_frequency_response
+
+N_ROOTS = (500, 2000, 8000)
+N_REPEATS = 200
+N_LOADED = 200
+
+def timed(function, n=N_REPEATS):
+    start = time.perf_counter()
+    for i in range(n):
+        function(i)
+    return (time.perf_counter() - start) / n * 1000
+
+def measure(n_roots):
+    zplane = Zplane()
+    zplane.resize(600, 600)
+    rng = np.random.default_rng(0)
+    roots = rng.uniform(-1, 1, n_roots) + 1j * rng.uniform(-1, 1, n_roots)
+    for root in roots[:-N_REPEATS]:
+        zplane.add_zero(root, conjugate=True)
+    add = timed(lambda i: zplane.add_zero(roots[n_roots - N_REPEATS + i], conjugate=True))
+
+    x, y = zplane.axes.transData.transform((roots[0].real, roots[0].imag))
+    zplane.on_press(MouseEvent("button_press_event", zplane, x, y, button=1))
+    points = zplane.axes.transData.transform(np.stack([np.linspace(-1, 1, N_REPEATS), np.linspace(1, -1, N_REPEATS)], axis=1))
+    move = timed(lambda i: zplane.on_move_item(MouseEvent("motion_notify_event", zplane, *points[i])))
+    zplane.on_release(MouseEvent("button_release_event", zplane, *points[-1], button=1))
+
+    read = timed(lambda i: (zplane.get_zeros(), zplane.get_poles()))
+    hit = timed(lambda i: zplane.hit_test(roots[i]))
+
+    # Double click on roots, each one is removed
+    clicks = zplane.axes.transData.transform(np.stack([roots[1:N_REPEATS + 1].real, roots[1:N_REPEATS + 1].imag], axis=1))
+    delete = timed(lambda i: zplane.on_press(MouseEvent("button_press_event", zplane, *clicks[i], button=1, dblclick=True)))
+    zplane.close()
+    return add, move, read, hit, delete
+
+def add_one_by_one(zplane, zeros, poles):
+    for zero, pole in zip(zeros, poles):
+        zplane.add_zero(zero, conjugate=True)
+        zplane.add_pole(pole, conjugate=True)
+
+def measure_load(mode):
+    updates = []
+    zplane = Zplane(callback_function=lambda *args: updates.append(get_frequency_response(zplane.get_zeros(), zplane.get_poles())))
+    rng = np.random.default_rng(0)
+    zeros = 0.9 * np.exp(1j * rng.uniform(0, np.pi, N_LOADED // 2))
+    poles = 0.5 * zeros
+    start = time.perf_counter()
+    if mode == "set_roots":
+        zplane.set_roots({"zero": (zeros, True), "pole": (poles, True)})
+    elif mode == "transaction":
+        with zplane.transaction():
+            add_one_by_one(zplane, zeros, poles)
+    else:
+        add_one_by_one(zplane, zeros, poles)
+    elapsed = time.perf_counter() - start
+    zplane.close()
+    return elapsed * 1000, len(updates)
+
+def main():
+    app = QApplication(sys.argv)
+    print("roots      add     move     read      hit   delete   (ms per operation)")
+    for n_roots in N_ROOTS:
+        add, move, read, hit, delete = measure(n_roots)
+        print(f"{n_roots:5d}   {add:6.3f}   {move:6.3f}   {read:6.3f}   {hit:6.3f}   {delete:6.3f}")
+
+    print(f"\nloading {N_LOADED} roots & their conjugates")
+    for mode in ("root by root", "transaction", "set_roots"):
+        elapsed, updates = measure_load(mode)
+        print(f"{mode:>12}   {elapsed:8.1f} ms   {updates:4d} response updates")
+
+if __name__ == '__main__':
+    main()
@@ -1,8 +1,7 @@
 # Package Importing
 
 import sys
-# Pandas & Numpy
-import pandas as pd
+# Numpy
 import numpy as np
 ## PyQt5
 from PyQt5 import *
@@ -15,6 +14,14 @@ from stylesheet import * # Styles of PyQt elements
 from zplane import Zplane
 from plotter import Plotter
 from mouse_pad import MousePad
+from ring_buffer import RingBuffer
+from playback import PlaybackScheduler
+from render_scheduler import scheduler
+from overview import Overview
+from minmax_pyramid import MinMaxPyramid, sidecar_path
+from signal_io import SIGNAL_EXTENSIONS
+from root_io import ROOT_EXTENSIONS, load_roots, save_roots
+from workers import LoadWorker, FilterWorker
 from signal_processing import * # Functions of the dsp
 
 # Main Window
@@ -28,12 +35,32 @@ class MainWindow(QMainWindow):
         self.setStyleSheet(general_stylesheet)
         
         # Variables
-        self.time = [] # Time array
-        self.original_signal = [] # Original Signal Array
-        self.filtered_signal = [] # Filtered Signal Array
+        self.signal_dtype = np.float64 # Type of the signal arrays, float32 halves their memory
+        self.time = np.zeros(0) # Time array
+        self.original_signal = np.zeros(0, dtype=self.signal_dtype) # Original Signal Array
+        self.filtered_signal = np.zeros(0, dtype=self.signal_dtype) # Filtered Signal Array
+        self.original_pyramid = None # Min/Max Pyramid of the Original Signal
+        self.signal_path = None # File the original signal was loaded from
+        self.filtered_pyramid = None # Min/Max Pyramid of the Filtered Signal
+        self.load_worker = None # Worker loading a file
+        self.load_partial_shown = False # First chunk of the load shown, the tab was switched then
+        self.filter_worker = None # Worker filtering the signal
+        self.running_workers = set() # Workers started on the pool, referenced until they finish
+        self.filter_checkpoints = None # Filter states saved at the start of every block of the filtered signal
+        self.filter_extension = None # Finished refilter worker whose window playback extends
+        self.refilter_window = 1 << 18 # Samples refiltered ahead of the playhead when the design changes while playing
+        self.filtered_ready = 0 # Samples of the filtered signal computed so far
+        self.playing = False
+        self.play_icons = {} # Play & pause icons, made once since reading them while a worker runs blocks
+        self.lazy_lookahead = 8192 # Samples filtered ahead of the window in lazy mode
+        self.mouse_filter = StreamingFilter() # Filter state of the mouse pad stream
+        self.frequency_response = FrequencyResponse() # Response of the design, updated for the roots that changed
+        self.mouse_pad_length = 2000 # Samples kept from the mouse pad stream
+        self.mouse_filtered_signal = RingBuffer(self.mouse_pad_length) # Filtered Mouse Pad Signal
         
         self.curr = 0 # Current Time
-        self.speed = 500 # Speed Value
+        self.speed = 500 # Speed Value, samples played per second
+        self.frame_interval = 16 # Milliseconds between playback frames
         self.resolution = 200 # Resolution Value
 
         # PyQt Elements Creation
@@ -53,11 +80,13 @@ class MainWindow(QMainWindow):
     def connect(self):
         # Control Buttons
         self.play_btn.clicked.connect(self.filter_data)
-        self.increase_btn.clicked.connect(lambda: self.speed_change(self.speed+100))
-        self.decrease_btn.clicked.connect(lambda: self.speed_change(self.speed-100))
+        # Buttons move the slider, which keeps the speed within its range
+        self.increase_btn.clicked.connect(lambda: self.speed_slider.setValue(self.speed+100))
+        self.decrease_btn.clicked.connect(lambda: self.speed_slider.setValue(self.speed-100))
         # Control Sliders
         self.speed_slider.valueChanged[int].connect(self.speed_change)
         self.resolution_slider.valueChanged[int].connect(self.resolution_change)
+        self.seek_slider.valueChanged[int].connect(self.seek)
         # All-Pass
         self.allpass_add_btn.clicked.connect(self.allpass_add_btn_function)
         self.allpass_remove_btn.clicked.connect(self.allpass_remove_btn_function)
@@ -70,25 +99,60 @@ class MainWindow(QMainWindow):
     # Set timers & threads for realtime
     def set_timers(self):
         # Setup a timer to trigger the redraw by calling filter_process_update.
+        # The playhead moves with the wall clock, the timer only sets the frame rate
         self.timer = QtCore.QTimer()
-        self.timer.setInterval(self.calc_speed())
+        self.timer.setInterval(self.frame_interval)
         self.timer.timeout.connect(self.filter_process_update)
+        self.playback = PlaybackScheduler(self.speed, self.frame_interval)
 
-    # Calculate Speed 
-    def calc_speed(self):
-        return self.speed_slider.maximum() - self.speed
+    # Start the playback frames, the clock restarts so a pause is not played
+    def start_playback(self):
+        self.playback.start()
+        self.timer.start()
 
     # Realtime Signal Filtering Update
-    def filter_process_update(self):       
+    def filter_process_update(self):
+        self.curr = max(min(self.curr + self.playback.advance(), len(self.original_signal) - 1), 0)
+        if self.playback.should_render():
+            # Rendered now instead of on the next render tick so the drawing time counts against the frame budget
+            self.plot_window()
+            scheduler.tick()
+            self.playback.rendered()
+
+        stats = self.playback.stats()
+        if stats is not None:
+            samples_rate, frame_rate, dropped = stats
+            self.playback_label.setText(f"{samples_rate:.0f} / {self.speed} samples/s, {frame_rate:.0f} fps, {dropped} dropped")
+            self.playback_label.show()
+        if isinstance(self.filtered_signal, LazyFilteredSignal):
+            self.filtered_signal.prefetch(self.curr + self.resolution + self.lazy_lookahead)
+        else:
+            self.extend_filtering()
+
+    # Plot the window of signals starting at the current time
+    def plot_window(self):
         start_point = self.curr
         end_point = self.curr + self.resolution
         realtime_original_signal = self.original_signal[start_point:end_point]
-        realtime_filtered_signal = self.filtered_signal[start_point:end_point]
+        realtime_filtered_signal = self.filtered_signal[start_point:min(end_point, self.filtered_ready)]
         realtime_time = self.time[start_point:end_point]
-        self.curr += 1
         
         self.original_signal_plotter.plot_signal(realtime_time, realtime_original_signal)
-        self.filtered_signal_plotter.plot_signal(realtime_time, realtime_filtered_signal)
+        self.filtered_signal_plotter.plot_signal(realtime_time[:len(realtime_filtered_signal)], realtime_filtered_signal)
+        if len(realtime_time) > 0:
+            self.overview.set_position(realtime_time[0], realtime_time[-1])
+
+        # Seek bar follows the playhead without seeking again
+        self.seek_slider.blockSignals(True)
+        self.seek_slider.setValue(self.curr)
+        self.seek_slider.blockSignals(False)
+        if len(realtime_time) > 0:
+            self.seek_slider_counter.setText(f"{realtime_time[0]:.2f}")
+
+    # Move the current time to a sample, from the seek bar or the overview strip
+    def seek(self, index):
+        self.curr = max(0, min(index, len(self.original_signal) - 1))
+        self.plot_window()
     
     ###############################################
     """UI Functions"""
@@ -108,6 +172,11 @@ class MainWindow(QMainWindow):
         # File menu
         file_menu = menu_bar.addMenu("File")
         file_menu.addAction(self.open_action)
+        file_menu.addAction(self.save_pyramid_action)
+        self.addSeparator(file_menu)
+        file_menu.addAction(self.import_roots_action)
+        file_menu.addAction(self.export_roots_action)
+        self.addSeparator(file_menu)
         file_menu.addAction(self.exit_action)
 
     # Context Menu Event
@@ -130,6 +199,24 @@ class MainWindow(QMainWindow):
         self.open_action.setShortcut("Ctrl+o")
         self.open_action.triggered.connect(self.open_data)
 
+        # Save Overview Index Action
+        self.save_pyramid_action = QAction("&Save Overview Index", self)
+        self.save_pyramid_action.setStatusTip('Save the overview index of the opened signal & of the next ones next to them')
+        self.save_pyramid_action.setCheckable(True)
+        self.save_pyramid_action.toggled.connect(self.save_pyramid_toggled)
+
+        # Import Roots Action
+        self.import_roots_action = QAction("&Import Zeros && Poles...", self)
+        self.import_roots_action.setStatusTip('Replace the zeros & poles of the Z plane by the ones of a file')
+        self.import_roots_action.setShortcut("Ctrl+i")
+        self.import_roots_action.triggered.connect(self.import_roots)
+
+        # Export Roots Action
+        self.export_roots_action = QAction("&Export Zeros && Poles...", self)
+        self.export_roots_action.setStatusTip('Save the zeros & poles of the Z plane to a file')
+        self.export_roots_action.setShortcut("Ctrl+e")
+        self.export_roots_action.triggered.connect(self.export_roots)
+
         # Exit Action
         self.exit_action = QAction(QIcon(":exit"), "&Exit", self)
         self.exit_action.setStatusTip('Good Bye !')
@@ -194,6 +281,29 @@ class MainWindow(QMainWindow):
                                  padding: 4px;""")
         self.statusbar.showMessage("Ready", 3000)
 
+        # Loading progress & cancellation, shown while a file is loading
+        self.loading_progress = QProgressBar()
+        self.loading_progress.setFormat("Loading %p%")
+        self.loading_progress.setMaximumWidth(200)
+        self.loading_progress.hide()
+        self.loading_cancel_btn = QPushButton("Cancel")
+        self.loading_cancel_btn.clicked.connect(self.cancel_loading)
+        self.loading_cancel_btn.hide()
+        self.statusbar.addPermanentWidget(self.loading_progress)
+        self.statusbar.addPermanentWidget(self.loading_cancel_btn)
+
+        # Filtering progress, shown while the signal is filtered
+        self.filter_progress = QProgressBar()
+        self.filter_progress.setFormat("Filtering %p%")
+        self.filter_progress.setMaximumWidth(200)
+        self.filter_progress.hide()
+        self.statusbar.addPermanentWidget(self.filter_progress)
+
+        # Achieved & target playback rates, shown while playing
+        self.playback_label = QLabel()
+        self.playback_label.hide()
+        self.statusbar.addPermanentWidget(self.playback_label)
+
         # Adding a permanent message
         self.statusbar.addPermanentWidget(QLabel("Realtime Digital Filter Design..."))
 
@@ -219,6 +329,8 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.filter_design_tab,"Filter Design")
         self.tabs.addTab(self.phase_correction_tab,"Phase Correction")
         self.tabs.addTab(self.applying_filter_tab,"Apply Filter")
+        # Canvases of a tab left dirty while it was hidden are drawn when it is shown
+        self.tabs.currentChanged.connect(lambda index: scheduler.wake())
                        
         # Set the central widget
         central_layout.addWidget(self.tabs)
@@ -327,17 +439,20 @@ class MainWindow(QMainWindow):
         applying_filter_layout = QVBoxLayout()
         signal_splitter = QSplitter(Qt.Vertical)
         
-        mouse_pad_area = MousePad(callback_function=self.draw_signal_by_mouse, title="M  o  u  s  e      P  a  d")
+        mouse_pad_area = MousePad(callback_function=self.draw_signal_by_mouse, title="M  o  u  s  e      P  a  d", sample_rate=1000, buffer_length=self.mouse_pad_length)
         plot_splitter = QSplitter(Qt.Horizontal)
         self.original_signal_plotter = Plotter(title="Realtime Signal", x_axis="time", y_axis="amplitude")
         self.filtered_signal_plotter = Plotter(title="Filtered Signal", x_axis="time", y_axis="amplitude")
         plot_splitter.addWidget(self.original_signal_plotter)
         plot_splitter.addWidget(self.filtered_signal_plotter)
+        self.overview = Overview(callback_function=self.seek)
 
         signal_splitter.addWidget(mouse_pad_area)
         signal_splitter.addWidget(plot_splitter)
+        signal_splitter.addWidget(self.overview)
         signal_splitter.setStretchFactor(0, 1)
         signal_splitter.setStretchFactor(1, 3)
+        signal_splitter.setStretchFactor(2, 1)
 
         container = QWidget(self)
         control_layout = QVBoxLayout(container)
@@ -352,7 +467,8 @@ class MainWindow(QMainWindow):
         
         ### Play Button
         self.play_btn = QPushButton()
-        self.play_btn.setIcon(QIcon(":play"))
+        self.play_icons = {"play": QIcon(":play"), "pause": QIcon(":pause")}
+        self.play_btn.setIcon(self.play_icons["play"])
         self.play_btn.setStyleSheet("font-size:15px; border-radius: 6px;border: 1px solid rgba(27, 31, 35, 0.15);padding: 5px 15px;")
         self.play_btn.setDisabled(True)
         
@@ -377,9 +493,10 @@ class MainWindow(QMainWindow):
         speed_slider_title = QLabel("Speed")
         self.speed_slider = QSlider(Qt.Horizontal)
         self.speed_slider.setMinimum(0)
-        self.speed_slider.setValue(self.speed)
         self.speed_slider.setMaximum(1000)
+        self.speed_slider.setValue(self.speed)
         self.speed_slider.setDisabled(True)
+        self.speed_slider.setStatusTip("Samples played per second")
         self.speed_slider_counter = QLabel(f"{self.speed}")
 
         speed_layout.addWidget(speed_slider_title,1)
@@ -404,10 +521,32 @@ class MainWindow(QMainWindow):
         lower_control_layout.addLayout(speed_layout)
         lower_control_layout.addSpacerItem(QSpacerItem(50, 5))
         lower_control_layout.addLayout(resolution_layout)
-        lower_control_layout.addSpacerItem(QSpacerItem(300, 5))
+        lower_control_layout.addSpacerItem(QSpacerItem(50, 5))
+
+        ### Lazy Filtering Checkbox
+        self.lazy_checkbox = QCheckBox("Lazy Filtering")
+        self.lazy_checkbox.setStatusTip('Filter blocks just ahead of the playhead instead of the whole signal')
+        lower_control_layout.addWidget(self.lazy_checkbox)
+        lower_control_layout.addSpacerItem(QSpacerItem(250, 5))
+
+        ## Seek Bar Layout, seeking filters from the closest saved filter state
+        seek_layout = QHBoxLayout()
+        seek_slider_title = QLabel("Position")
+        self.seek_slider = QSlider(Qt.Horizontal)
+        self.seek_slider.setMinimum(0)
+        self.seek_slider.setMaximum(0)
+        self.seek_slider.setDisabled(True)
+        self.seek_slider_counter = QLabel("0")
+
+        seek_layout.addSpacerItem(QSpacerItem(300, 5))
+        seek_layout.addWidget(seek_slider_title,1)
+        seek_layout.addWidget(self.seek_slider,20)
+        seek_layout.addWidget(self.seek_slider_counter,1)
+        seek_layout.addSpacerItem(QSpacerItem(250, 5))
 
         control_layout.addLayout(upper_control_layout)
         control_layout.addLayout(lower_control_layout)
+        control_layout.addLayout(seek_layout)
 
         applying_filter_layout.addWidget(signal_splitter,100)
         applying_filter_layout.addWidget(container,1)
@@ -422,7 +561,7 @@ class MainWindow(QMainWindow):
     def open_data(self):
         file_dialog = QFileDialog()
         file_dialog.setFileMode(QFileDialog.ExistingFile)
-        file_dialog.setNameFilter("Signal Files (*.csv)")
+        file_dialog.setNameFilter(f"Signal Files ({' '.join('*' + extension for extension in SIGNAL_EXTENSIONS)})")
         if file_dialog.exec_():
             filenames = file_dialog.selectedFiles()
             if len(filenames) > 0:
@@ -433,21 +572,132 @@ class MainWindow(QMainWindow):
                     print(e)
                     QMessageBox.critical(self, "Error", "Unable to open the audio file.")                    
 
-    # Load data
+    # Load data on a worker thread, a load already in progress is cancelled
     def load_data(self, path):
-        # load the signal & time
-        csv_file = pd.read_csv(path)
-        if csv_file.shape[0] > 10000:
-            self.original_signal = csv_file.iloc[:,1].values.tolist()
-            self.time = csv_file.iloc[:,0].values.tolist()
-        else:
-            QMessageBox.critical(self,
-                                "Error !",
-                                f"The signal must be 10,000 points at minimum.")
+        self.cancel_loading()
+        self.load_worker = LoadWorker(path, self.signal_dtype, self.save_pyramid_action.isChecked())
+        self.load_partial_shown = False
+        worker = self.load_worker
+        worker.signals.partial.connect(lambda data: self.on_load_partial(worker, data))
+        worker.signals.progress.connect(lambda progress: self.on_load_progress(worker, progress))
+        worker.signals.finished.connect(lambda result: self.on_load_finished(worker, result))
+        worker.signals.error.connect(lambda message: self.on_load_error(worker, message))
+        self.show_loading_progress(0)
+        self.start_worker(worker)
+
+    # Checking the action also saves the overview index of the signal already opened
+    def save_pyramid_toggled(self, checked):
+        if not checked or self.signal_path is None or self.original_pyramid is None: return
+        try:
+            self.original_pyramid.save(sidecar_path(self.signal_path), source=self.signal_path)
+            self.statusbar.showMessage("Overview index saved", 3000)
+        except OSError as e:
+            print(e)
+            QMessageBox.critical(self, "Error", "Unable to save the overview index.")
+
+    # Start a worker on the pool, it is referenced until it finishes since the pool does not delete it
+    def start_worker(self, worker):
+        self.running_workers.add(worker)
+        worker.signals.finished.connect(lambda _: self.running_workers.discard(worker))
+        worker.signals.error.connect(lambda _: self.running_workers.discard(worker))
+        QThreadPool.globalInstance().start(worker)
+
+    # Signal must be long enough to be played, for a CSV the first chunk is enough to know
+    def check_signal_length(self, signal) -> bool:
+        if len(signal) > 10000: return True
+        QMessageBox.critical(self,
+                            "Error !",
+                            f"The signal must be 10,000 points at minimum.")
+        return False
+
+    # First chunk of a CSV: shown while the rest is parsed
+    def on_load_partial(self, worker, data):
+        if worker is not self.load_worker: return
+        time, signal = data
+        if not self.check_signal_length(signal):
+            self.cancel_loading()
+            self.load_worker = None
+            self.hide_loading_progress()
             return
-        
+        self.set_signal(time, signal)
+        self.load_partial_shown = True
+
+        # Move to Filter Applying Tab
+        self.tabs.setCurrentIndex(2)
+
+    def on_load_progress(self, worker, progress):
+        if worker is not self.load_worker: return
+        self.show_loading_progress(progress)
+
+    # Whole file loaded, or what was parsed before the load was cancelled
+    def on_load_finished(self, worker, result):
+        if worker is not self.load_worker: return
+        self.load_worker = None
+        self.hide_loading_progress()
+        time, signal, pyramid, complete = result
+        if not self.check_signal_length(signal): return
+        if not complete:
+            self.statusbar.showMessage("Loading cancelled", 3000)
+        # A memory-mapped file was already shown whole, only its pyramid is new
+        if self.load_partial_shown and signal is self.original_signal:
+            self.set_pyramid(pyramid)
+        else:
+            self.set_signal(time, signal, pyramid)
+        self.signal_path = worker.path if complete else None
+
+        # Move to Filter Applying Tab, unless it was done when the first chunk was shown
+        if not self.load_partial_shown:
+            self.tabs.setCurrentIndex(2)
+
+    def on_load_error(self, worker, message):
+        if worker is not self.load_worker: return
+        self.load_worker = None
+        self.hide_loading_progress()
+        print(message)
+        QMessageBox.critical(self, "Error", "Unable to open the signal file.")
+
+    # Stop the load in progress, the worker still sends what it parsed
+    def cancel_loading(self):
+        if self.load_worker is None: return
+        self.load_worker.cancel()
+
+    def show_loading_progress(self, progress):
+        self.loading_progress.setValue(int(progress * 100))
+        self.loading_progress.show()
+        self.loading_cancel_btn.show()
+
+    def hide_loading_progress(self):
+        self.loading_progress.hide()
+        self.loading_cancel_btn.hide()
+
+    # Set the original signal, plot it & enable the controls
+    # A memory-mapped signal is not read whole here, only its first window is plotted until `set_pyramid`
+    # Its full filtered output would take as much memory as its samples or more, lazy filtering is preselected
+    def set_signal(self, time, signal, pyramid=None):
+        memory_mapped = isinstance(signal, np.memmap)
+        self.original_signal = signal
+        self.time = time
+        self.original_pyramid = pyramid if pyramid is not None or memory_mapped else MinMaxPyramid(signal)
+        self.filtered_pyramid = None
+        self.signal_path = None # Set once a load of the whole file finished
+        self.curr = 0
+
+        # Playback & filtering of the previous signal stop
+        if self.playing:
+            self.filter_data()
+        self.cancel_filtering()
+        self.filtered_signal = np.zeros(0, dtype=self.signal_dtype)
+        self.filter_checkpoints = None
+        self.filtered_ready = 0
+
         # Plot
-        self.original_signal_plotter.plot_signal(self.time, self.original_signal)
+        if self.original_pyramid is not None:
+            self.original_signal_plotter.plot_signal(self.time, self.original_signal, self.original_pyramid)
+        else:
+            self.plot_window()
+        self.overview.set_signal(self.time, self.original_pyramid)
+        if memory_mapped:
+            self.lazy_checkbox.setChecked(True)
         
         # Enable control buttons
         self.play_btn.setEnabled(True)
@@ -455,21 +705,137 @@ class MainWindow(QMainWindow):
         self.increase_btn.setEnabled(True)
         self.speed_slider.setEnabled(True)
         self.resolution_slider.setEnabled(True)
-                        
-        # Move to Filter Applying Tab
-        self.tabs.setCurrentIndex(2)
+        self.seek_slider.blockSignals(True)
+        self.seek_slider.setMaximum(max(len(signal) - 1, 0))
+        self.seek_slider.setValue(0)
+        self.seek_slider.blockSignals(False)
+        self.seek_slider.setEnabled(True)
+
+    # Pyramid of the signal shown, built after it was set, the playhead & filtering go on
+    # The whole signal is plotted like `set_signal` does unless the playhead already moved
+    def set_pyramid(self, pyramid):
+        self.original_pyramid = pyramid
+        if pyramid is None: return
+        if not self.playing and self.curr == 0:
+            self.original_signal_plotter.plot_signal(self.time, self.original_signal, pyramid)
+        self.overview.set_signal(self.time, pyramid)
 
-    # Filter Data based on zeros & poles
+    # Play & pause, playing filters the signal on a worker thread with the current zeros & poles
     def filter_data(self):
-        if self.timer.isActive() == False:
-            self.play_btn.setIcon(QIcon(":pause"))
-            z = self.z_plane.get_zeros()
-            p = self.z_plane.get_poles()
-            self.filtered_signal = filter_signal(self.original_signal, z, p)
-            self.timer.start()
+        if not self.playing:
+            self.playing = True
+            self.play_btn.setIcon(self.play_icons["pause"])
+            self.start_filtering()
         else:
-            self.play_btn.setIcon(QIcon(":play"))
+            self.playing = False
+            self.play_btn.setIcon(self.play_icons["play"])
             self.timer.stop()
+            self.playback_label.hide()
+
+    # Filter the signal on a worker, the filtering in progress is cancelled
+    # From the playhead: the output before the playhead is kept & the `refilter_window` samples from it are filtered,
+    # playback extends the window while it plays (see `extend_filtering`)
+    def start_filtering(self, from_playhead=False):
+        self.cancel_filtering(wait=from_playhead)
+        z = self.z_plane.get_zeros()
+        p = self.z_plane.get_poles()
+
+        # Lazy mode: blocks are filtered when the playhead gets close to them
+        # Blocks & checkpoints of the same signal are kept across plays, they are dropped once the design changes
+        if self.lazy_checkbox.isChecked():
+            lazy_signal = self.filtered_signal
+            if (isinstance(lazy_signal, LazyFilteredSignal) and lazy_signal.signal is self.original_signal
+                    and lazy_signal.dtype == self.signal_dtype):
+                if not lazy_signal.has_design(z, p):
+                    lazy_signal.set_design(z, p, position=self.curr)
+            else:
+                self.filtered_signal = LazyFilteredSignal(self.original_signal, z, p, dtype=self.signal_dtype)
+            self.filtered_ready = len(self.original_signal)
+            self.filtered_pyramid = None
+            self.overview.set_filtered(None)
+            self.start_playback()
+            return
+
+        if from_playhead and self.filter_checkpoints is not None and len(self.filtered_signal) == len(self.original_signal):
+            start = min(self.curr, len(self.original_signal) - 1)
+            worker = FilterWorker(self.original_signal, z, p, self.signal_dtype, output=self.filtered_signal,
+                                  checkpoints=self.filter_checkpoints, start=start, stop=start + self.refilter_window)
+        else:
+            worker = FilterWorker(self.original_signal, z, p, self.signal_dtype)
+        self.run_filter_worker(worker)
+
+    # Filter the next window of a refilter once the playhead gets within half a window of its end
+    # The design is unchanged, the worker continues from the final state of the previous window
+    def extend_filtering(self):
+        previous = self.filter_extension
+        if previous is None or self.filter_worker is not None: return
+        if self.curr + self.resolution + self.refilter_window // 2 < previous.stop: return
+        self.filter_extension = None
+        self.run_filter_worker(FilterWorker(self.original_signal, previous.z, previous.p, self.signal_dtype,
+                                            output=previous.output, checkpoints=previous.checkpoints,
+                                            start=previous.stop, stop=previous.stop + self.refilter_window,
+                                            zi=previous.filter.get_state()))
+
+    # Start a filter worker writing the filtered signal from its `start`
+    def run_filter_worker(self, worker):
+        self.filter_worker = worker
+        self.filter_checkpoints = worker.checkpoints
+        worker.signals.partial.connect(lambda ready: self.on_filter_partial(worker, ready))
+        worker.signals.progress.connect(lambda progress: self.on_filter_progress(worker, progress))
+        worker.signals.finished.connect(lambda result: self.on_filter_finished(worker, result))
+        worker.signals.error.connect(lambda message: self.on_filter_error(worker, message))
+
+        # Samples of the output are filled while playing
+        self.filtered_signal = worker.output
+        self.filtered_ready = worker.start
+        self.filter_progress.setValue(0)
+        self.filter_progress.show()
+        self.start_worker(worker)
+
+    # Stop the filtering in progress, `wait` until it stops writing to its output to reuse it
+    # A worker still queued in the pool (e.g. behind one building its pyramid) is removed instead
+    def cancel_filtering(self, wait=False):
+        self.filter_extension = None
+        if self.filter_worker is None: return
+        self.filter_worker.cancel()
+        if wait and not self.filter_worker.done.is_set() and not self.take_queued_worker(self.filter_worker):
+            self.filter_worker.done.wait()
+        self.filter_worker = None
+        self.filter_progress.hide()
+
+    # Remove a worker from the pool queue before it starts, False if it already started
+    def take_queued_worker(self, worker) -> bool:
+        taken = QThreadPool.globalInstance().tryTake(worker)
+        if taken:
+            self.running_workers.discard(worker)
+        return taken
+
+    # Playback starts as soon as the first block is filtered
+    def on_filter_partial(self, worker, ready):
+        if worker is not self.filter_worker: return
+        self.filtered_ready = ready
+        if self.playing and not self.timer.isActive():
+            self.start_playback()
+
+    def on_filter_progress(self, worker, progress):
+        if worker is not self.filter_worker: return
+        self.filter_progress.setValue(int(progress * 100))
+
+    def on_filter_finished(self, worker, result):
+        if worker is not self.filter_worker: return
+        self.filter_worker = None
+        self.filter_progress.hide()
+        _, self.filtered_pyramid, complete = result
+        self.overview.set_filtered(self.filtered_pyramid)
+        # A refilter window ended before the signal, playback filters the next one
+        if not complete and not worker.cancelled and worker.stop < len(worker.signal):
+            self.filter_extension = worker
+
+    def on_filter_error(self, worker, message):
+        if worker is not self.filter_worker: return
+        self.cancel_filtering()
+        print(message)
+        QMessageBox.critical(self, "Error", "Unable to filter the signal.")
 
     ###############################################
     """Z Plane Functions"""
@@ -497,6 +863,33 @@ class MainWindow(QMainWindow):
     ## Clear all zeros & poles in Z plane
     def clear_all(self):
         self.z_plane.clear_all()
+
+    ## Import zeros & poles from a file, all placed at once with a single response update
+    def import_roots(self):
+        filename, _ = QFileDialog.getOpenFileName(self, "Import Zeros & Poles", "",
+                                                  f"Root Files ({' '.join('*' + extension for extension in ROOT_EXTENSIONS)})")
+        if not filename: return
+        try:
+            roots = load_roots(filename)
+        except Exception as e:
+            print(e)
+            QMessageBox.critical(self, "Error", "Unable to import the zeros & poles.")
+            return
+        self.z_plane.set_roots(roots)
+
+    ## Export zeros & poles to a file, the type is given by its extension
+    def export_roots(self):
+        filters = [f"{extension[1:].upper()} (*{extension})" for extension in ROOT_EXTENSIONS]
+        filename, selected_filter = QFileDialog.getSaveFileName(self, "Export Zeros & Poles", "roots.json", ";;".join(filters))
+        if not filename: return
+        # Name typed without extension, the one of the selected filter is used
+        if not filename.lower().endswith(ROOT_EXTENSIONS):
+            filename += ROOT_EXTENSIONS[filters.index(selected_filter)] if selected_filter in filters else ROOT_EXTENSIONS[0]
+        try:
+            save_roots(filename, self.z_plane.get_roots())
+        except Exception as e:
+            print(e)
+            QMessageBox.critical(self, "Error", "Unable to export the zeros & poles.")
     
     # Callback function when change on Z plane to update magnitude & phase Response
     def update_response(self, go_to_zplane=True):
@@ -505,7 +898,18 @@ class MainWindow(QMainWindow):
         p = self.z_plane.get_poles()
         
         # Get Frequency Response (magnitude & phase)
-        w, mag, phase = get_frequency_response(z,p)
+        w, mag, phase = self.frequency_response.update(z, p)
+
+        # Mouse pad stream continues with the new design
+        self.mouse_filter.set_design(z, p)
+
+        # Filtered signal is refiltered from the playhead while playing, the history before it is kept
+        if isinstance(self.filtered_signal, LazyFilteredSignal):
+            self.filtered_signal.set_design(z, p, position=self.curr)
+        elif self.playing:
+            self.start_filtering(from_playhead=True)
+        else:
+            self.cancel_filtering()
 
         # Plot Responses
         self.magnitude_response_plotter.plot_signal(w, mag)
@@ -522,9 +926,10 @@ class MainWindow(QMainWindow):
 
     # When Speed Change
     def speed_change(self, speed):
+        speed = min(max(speed, self.speed_slider.minimum()), self.speed_slider.maximum())
         self.speed_slider_counter.setText(f"{speed}")
         self.speed = speed
-        self.timer.setInterval(self.calc_speed())
+        self.playback.set_sample_rate(speed)
     
     # When Resolution Change
     def resolution_change(self, resolution):
@@ -536,20 +941,16 @@ class MainWindow(QMainWindow):
     ###############################################
     
     # Callback function when mouse draw on mouse pad to generate a signal
-    def draw_signal_by_mouse(self, y=[0], counter=0, interval=10):
-        if len(y) < interval: return
-        
-        # Generate x axis
-        x = np.arange(counter, counter+interval)
-        self.original_signal_plotter.plot_signal(x[10:], y[10:]) # Plot signal drawn
-        
-        # Get zeros & poles
-        z = self.z_plane.get_zeros()
-        p = self.z_plane.get_poles()
+    def draw_signal_by_mouse(self, y=[0], new_samples=[0], counter=0):
+        # Filter only the new samples, the filter state is kept between calls
+        filtered_samples = self.mouse_filter.process(new_samples)
+        self.mouse_filtered_signal.extend(np.real(filtered_samples))
+        if len(y) < 2: return
 
-        # Filter signal drawn then plot
-        filtered_y = filter_signal(y, z, p)
-        self.filtered_signal_plotter.plot_signal(x[1:], filtered_y[1:])
+        # Generate x axis
+        x = np.arange(counter - len(y) + 1, counter + 1)
+        self.original_signal_plotter.plot_signal(x, y) # Plot signal drawn
+        self.filtered_signal_plotter.plot_signal(x, self.mouse_filtered_signal.view(len(y)))
 
     ###############################################
     """All-Pass Functions"""
@@ -634,8 +1035,10 @@ class MainWindow(QMainWindow):
         allpass_plane = Zplane(title=f"{a.real} + {a.imag}j", axis_exist=False)
         allpass_plane.setEnabled(False)
         
-        allpass_plane.add_zero(a)
-        allpass_plane.add_pole(a_conj)
+        # Zero & pole of the thumbnail are drawn once
+        with allpass_plane.transaction():
+            allpass_plane.add_zero(a)
+            allpass_plane.add_pole(a_conj)
         
         a_btn = QPushButton("Add")
         a_btn.clicked.connect(lambda _: self.allpass_add_to_correction_phase(a))
@@ -654,6 +1057,10 @@ class MainWindow(QMainWindow):
 
     ## Close the application
     def closeEvent(self, QCloseEvent):
+        # Workers still running are stopped before the window they report to goes away
+        self.cancel_loading()
+        self.cancel_filtering()
+        QThreadPool.globalInstance().waitForDone()
         super().closeEvent(QCloseEvent)
     
     # Exit the application  
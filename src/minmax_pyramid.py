@@ -0,0 +1,122 @@
+import os
+import numpy as np
+
+class MinMaxPyramid():
+    """Multi-resolution min/max index of a signal
+
+    Level `k` holds the minimum & maximum of every bucket of `block * 2**k`
+    samples, so any range of the signal can be drawn at any zoom from the
+    level whose buckets are closest to one per pixel.
+    """
+
+    def __init__(self, y=None, block:int=16, chunk_buckets:int=1 << 16):
+        self.block = block
+        self.chunk_buckets = chunk_buckets # Buckets of the signal reduced at once, a memory-mapped signal is read chunk by chunk
+        self.length = 0
+        self.mins = []
+        self.maxs = []
+        if y is not None:
+            self.build(y)
+
+    # Build every level, the last one has a single bucket, NaN samples are ignored
+    def build(self, y):
+        self.length = len(y)
+        self.mins, self.maxs = [], []
+        if self.length == 0: return
+
+        # Full buckets are reduced chunk by chunk, the last partial bucket on its own
+        n_full = self.length // self.block
+        n_buckets = -(-self.length // self.block)
+        dtype = np.real(np.asarray(y[:1])).dtype
+        mins, maxs = np.empty(n_buckets, dtype=dtype), np.empty(n_buckets, dtype=dtype)
+        chunk = self.chunk_buckets * self.block
+        for start in range(0, n_full * self.block, chunk):
+            stop = min(start + chunk, n_full * self.block)
+            buckets = np.real(np.asarray(y[start:stop])).reshape(-1, self.block)
+            mins[start // self.block:stop // self.block] = np.fmin.reduce(buckets, axis=1)
+            maxs[start // self.block:stop // self.block] = np.fmax.reduce(buckets, axis=1)
+        if n_buckets > n_full:
+            tail = np.real(np.asarray(y[n_full * self.block:]))
+            mins[-1], maxs[-1] = np.fmin.reduce(tail), np.fmax.reduce(tail)
+        self.mins.append(mins)
+        self.maxs.append(maxs)
+
+        while len(mins) > 1:
+            if len(mins) % 2:
+                mins = np.append(mins, mins[-1])
+                maxs = np.append(maxs, maxs[-1])
+            mins = np.fmin.reduce(mins.reshape(-1, 2), axis=1)
+            maxs = np.fmax.reduce(maxs.reshape(-1, 2), axis=1)
+            self.mins.append(mins)
+            self.maxs.append(maxs)
+
+    def __len__(self):
+        return self.length
+
+    # Minimum & maximum of the whole signal from the single bucket of the last level, None if they are not finite
+    def value_range(self):
+        if not self.mins: return None
+        low, high = float(self.mins[-1][0]), float(self.maxs[-1][0])
+        return (low, high) if np.isfinite(low) and np.isfinite(high) else None
+
+    # Samples per bucket of a level
+    def bucket_size(self, level:int) -> int:
+        return self.block << level
+
+    # Finest level with at most `n_buckets` buckets over `n_samples` samples
+    def level_for(self, n_samples:int, n_buckets:int) -> int:
+        level = 0
+        while level < len(self.mins) - 1 and n_samples / self.bucket_size(level) > n_buckets:
+            level += 1
+        return level
+
+    # Min/max envelope of samples [start, stop) with about `n_pixels` buckets
+    # Returns the sample index of each point & its value, minimum then maximum of every bucket
+    def envelope(self, start:int, stop:int, n_pixels:int):
+        start, stop = max(int(start), 0), min(int(stop), self.length)
+        if stop <= start or not self.mins:
+            return np.zeros(0, dtype=int), np.zeros(0)
+
+        level = self.level_for(stop - start, max(int(n_pixels), 1))
+        size = self.bucket_size(level)
+        first, last = start // size, -(-stop // size)
+        mins = self.mins[level][first:last]
+        maxs = self.maxs[level][first:last]
+
+        indices = np.arange(first, last) * size
+        indices = np.stack([indices, np.minimum(indices + size // 2, self.length - 1)], axis=1).ravel()
+        values = np.stack([mins, maxs], axis=1).ravel()
+        return np.clip(indices, 0, self.length - 1), values
+
+    # Save the levels to a `.npz` file, `source` is the file the signal was read from
+    def save(self, path, source=None):
+        levels = {f"mins_{i}": mins for i, mins in enumerate(self.mins)}
+        levels.update({f"maxs_{i}": maxs for i, maxs in enumerate(self.maxs)})
+        np.savez(path, block=self.block, length=self.length, source_stamp=source_stamp(source), **levels)
+
+    # Load levels saved by `save`, None when missing or out of date with `source`
+    @classmethod
+    def load(cls, path, source=None):
+        if not os.path.exists(path): return None
+        try:
+            with np.load(path) as saved:
+                if not np.array_equal(saved["source_stamp"], source_stamp(source)): return None
+                pyramid = cls(block=int(saved["block"]))
+                pyramid.length = int(saved["length"])
+                n_levels = len([key for key in saved.files if key.startswith("mins_")])
+                pyramid.mins = [saved[f"mins_{i}"] for i in range(n_levels)]
+                pyramid.maxs = [saved[f"maxs_{i}"] for i in range(n_levels)]
+        except (OSError, KeyError, ValueError):
+            return None
+        return pyramid
+
+# Sidecar file of a signal file
+def sidecar_path(path) -> str:
+    return f"{path}.pyramid.npz"
+
+# Size & modification time of the source, to know when a sidecar is out of date
+def source_stamp(source):
+    if source is None or not os.path.exists(source):
+        return np.zeros(2)
+    stat = os.stat(source)
+    return np.array([stat.st_size, stat.st_mtime])
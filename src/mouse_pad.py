@@ -4,13 +4,18 @@
 
 # math & matrix computations library
 import random
+import time
 import numpy as np
 
+# PyQt5 timer for the fixed rate sample clock
+from PyQt5.QtCore import QTimer
+
 # Matplotlib
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from collections import defaultdict
 from matplotlib.backend_bases import PickEvent
+from ring_buffer import RingBuffer
 
 class MousePad(FigureCanvasQTAgg):
     """Z plane Class
@@ -19,7 +24,7 @@ class MousePad(FigureCanvasQTAgg):
         FigureCanvasQTAgg (_type_)
     """
 
-    def __init__(self, parent=None, callback_function=None, title="Mouse Pad"):
+    def __init__(self, parent=None, callback_function=None, title="Mouse Pad", sample_rate=None, block_interval=20, buffer_length=100):
         self.fig = Figure(figsize=(6, 6))
         super(MousePad, self).__init__(self.fig)
         
@@ -28,9 +33,18 @@ class MousePad(FigureCanvasQTAgg):
         
         # Variables
         self.clicked = None
-        self.mouse_real_time_signal = []
+        self.mouse_real_time_signal = RingBuffer(buffer_length)
         self.counter = 0
 
+        # Fixed rate mode: timestamped positions are resampled every `block_interval` ms
+        self.sample_rate = sample_rate
+        self.event_times = []
+        self.event_values = []
+        self.next_sample_time = None
+        self.block_timer = QTimer()
+        self.block_timer.setInterval(block_interval)
+        self.block_timer.timeout.connect(self.deliver_block)
+
         # Callback function
         self.callback_function = callback_function
 
@@ -73,21 +87,68 @@ class MousePad(FigureCanvasQTAgg):
         self.mpl_connect("motion_notify_event", self.on_move)
         self.mpl_connect("button_release_event", self.on_release)
 
+    # Set the rate of the sample clock, None to record one sample per motion event
+    def set_sample_rate(self, sample_rate=None):
+        self.sample_rate = sample_rate
+        self.block_timer.stop()
+
     def on_press(self, event):
         self.clicked = True
+        if self.sample_rate is None or event.xdata is None: return
+        self.start_sample_clock(event.xdata)
+
+    # Start the sample clock at a position, on the press or on the first move inside the axes
+    def start_sample_clock(self, x):
+        now = time.perf_counter()
+        self.event_times = [now]
+        self.event_values = [x]
+        self.next_sample_time = now
+        self.block_timer.start()
    
     def on_move(self, event):
         if self.clicked is None: return
         if event.xdata is None: return
         if event.ydata is None: return
-        
-        interval = 100
-        self.mouse_real_time_signal.append(event.xdata)
-        if len(self.mouse_real_time_signal) > interval: 
-            self.mouse_real_time_signal.pop(0)
-            self.callback_function(self.mouse_real_time_signal, self.counter, interval)
-        self.counter += 1
+
+        if self.sample_rate is not None:
+            # Pressed outside the axes, the clock starts once the mouse enters them
+            if not self.block_timer.isActive():
+                self.start_sample_clock(event.xdata)
+                return
+            self.event_times.append(time.perf_counter())
+            self.event_values.append(event.xdata)
+            return
+
+        self.add_samples([event.xdata])
+
+    # Append new samples to the window & send them
+    def add_samples(self, samples):
+        self.mouse_real_time_signal.extend(samples)
+        # Window of the drawn signal & the samples that just arrived
+        self.callback_function(self.mouse_real_time_signal.view(), samples, self.counter + len(samples) - 1)
+        self.counter += len(samples)
+
+    # Interpolate the positions received since the last block onto the sample clock
+    def deliver_block(self):
+        if not self.event_times: return
+        now = time.perf_counter()
+        n = int((now - self.next_sample_time) * self.sample_rate) + 1
+        if n <= 0: return
+
+        sample_times = self.next_sample_time + np.arange(n) / self.sample_rate
+        samples = np.interp(sample_times, self.event_times, self.event_values)
+        self.next_sample_time = sample_times[-1] + 1 / self.sample_rate
+
+        # Keep the last position to interpolate the next block from it
+        self.event_times = self.event_times[-1:]
+        self.event_values = self.event_values[-1:]
+        self.add_samples(samples)
             
     def on_release(self, event):
         if self.clicked is None: return
-        self.clicked = None
\ No newline at end of file
+        self.clicked = None
+        if self.block_timer.isActive():
+            self.deliver_block()
+            self.block_timer.stop()
+        self.event_times = []
+        self.event_values = []
\ No newline at end of file
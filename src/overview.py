@@ -0,0 +1,122 @@
+# matplotlib
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+from matplotlib import patches
+import numpy as np
+from signal_io import UniformTime
+from render_scheduler import scheduler
+
+
+class Overview(FigureCanvasQTAgg):
+    """Strip of the whole signal drawn from its min/max pyramids, click or drag on it to scrub
+
+    Args:
+        callback_function: called with the sample index under the mouse while scrubbing
+    """
+
+    def __init__(self, parent=None, callback_function=None):
+        self.fig = Figure(facecolor="white", figsize=(6, 1))
+        self.axes = self.fig.add_axes([0.01, 0.08, 0.98, 0.84])
+        super(Overview, self).__init__(self.fig)
+        self.setMinimumHeight(60)
+        self.setMaximumHeight(120)
+
+        # Variables
+        self.callback_function = callback_function
+        self.time = np.zeros(0)
+        self.pyramids = {} # Pyramid of the original & filtered signals
+        self.colors = {"original": "#64B5CD", "filtered": "#C44E52"}
+        self.envelopes = []
+        self.scrubbing = False
+
+        # Playhead window, blitted over the cached background
+        self.playhead = patches.Rectangle((0, 0), 0, 1, transform=self.axes.get_xaxis_transform(),
+                                          color="black", alpha=0.25, animated=True)
+        self.axes.add_patch(self.playhead)
+        self.background = None
+
+        self.set_settings()
+        self.set_events()
+
+    def set_settings(self):
+        self.axes.set_facecolor("#EAEAF2")
+        for spine in self.axes.spines.values():
+            spine.set_visible(False)
+        self.axes.get_xaxis().set_visible(False)
+        self.axes.get_yaxis().set_visible(False)
+
+    # Events
+    def set_events(self):
+        self.mpl_connect("draw_event", self.on_draw)
+        self.mpl_connect("resize_event", self.draw_envelopes)
+        self.mpl_connect("button_press_event", self.on_press)
+        self.mpl_connect("motion_notify_event", self.on_move)
+        self.mpl_connect("button_release_event", self.on_release)
+
+    # New signal, the filtered envelope is dropped
+    def set_signal(self, time, pyramid):
+        self.time = time if isinstance(time, UniformTime) else np.asarray(time)
+        self.pyramids = {"original": pyramid}
+        if len(self.time) > 1:
+            self.axes.set_xlim(self.time[0], self.time[-1])
+        self.draw_envelopes()
+
+    def set_filtered(self, pyramid):
+        self.pyramids["filtered"] = pyramid
+        self.draw_envelopes()
+
+    # Envelopes with one bucket per pixel
+    def draw_envelopes(self, *args):
+        [envelope.remove() for envelope in self.envelopes]
+        self.envelopes.clear()
+
+        n_pixels = self.axes.bbox.width
+        y_low, y_high = np.inf, -np.inf
+        for name, pyramid in self.pyramids.items():
+            if pyramid is None or len(pyramid) != len(self.time): continue
+            indices, values = pyramid.envelope(0, len(pyramid), n_pixels)
+            mins, maxs = values[0::2], values[1::2]
+            envelope = self.axes.fill_between(self.time[indices[0::2]], mins, maxs, color=self.colors[name], alpha=0.6, linewidth=0)
+            self.envelopes.append(envelope)
+            y_low, y_high = min(y_low, mins.min()), max(y_high, maxs.max())
+
+        if np.isfinite(y_low) and np.isfinite(y_high) and y_high > y_low:
+            self.axes.set_ylim(y_low, y_high)
+        scheduler.request_draw(self)
+
+    # Move the playhead window to [start, end] in time units
+    def set_position(self, start, end):
+        self.playhead.set_x(start)
+        self.playhead.set_width(end - start)
+        scheduler.request_blit(self, self.blit_playhead)
+
+    # Draw the playhead over the cached background
+    def blit_playhead(self):
+        if self.background is None: return
+        self.restore_region(self.background)
+        self.axes.draw_artist(self.playhead)
+        self.blit(self.axes.bbox)
+
+    # Cache the background without the playhead after every full draw, then draw the playhead on it
+    def on_draw(self, event):
+        self.background = self.copy_from_bbox(self.axes.bbox)
+        self.axes.draw_artist(self.playhead)
+
+    # Scrubbing
+    def scrub(self, event):
+        if event.xdata is None or len(self.time) == 0: return
+        index = int(self.time.searchsorted(event.xdata))
+        if self.callback_function:
+            self.callback_function(min(index, len(self.time) - 1))
+
+    def on_press(self, event):
+        if not event.inaxes: return
+        self.scrubbing = True
+        self.scrub(event)
+
+    def on_move(self, event):
+        if self.scrubbing:
+            self.scrub(event)
+
+    def on_release(self, event):
+        self.scrubbing = False
@@ -0,0 +1,65 @@
+from PyQt5.QtCore import QElapsedTimer
+
+class PlaybackScheduler():
+    """Wall clock of the playback
+
+    Every frame advances by the samples that elapsed at `sample_rate` since the
+    previous one, whatever the timer interval or the drawing time. Frames are
+    not rendered while the drawing is behind the `frame_interval` budget.
+    """
+
+    def __init__(self, sample_rate:float=500.0, frame_interval:int=16, stats_interval:int=1000):
+        self.sample_rate = sample_rate
+        self.frame_interval = frame_interval # Frame budget in milliseconds
+        self.stats_interval = stats_interval # Milliseconds the achieved rates are measured over
+        self.clock = QElapsedTimer()
+        self.start()
+
+    # Start the clock, the time before (e.g. a pause) is not played
+    def start(self):
+        self.clock.start()
+        self.last_frame = 0 # Nanoseconds of the clock at the previous frame
+        self.render_start = 0
+        self.carry = 0.0 # Elapsed part of a sample not played yet
+        self.debt = 0.0 # Milliseconds the rendering is behind the frame budget
+        self.stats_start = 0
+        self.samples = self.frames = self.dropped = 0
+
+    def set_sample_rate(self, sample_rate:float):
+        self.sample_rate = sample_rate
+
+    # Samples to advance since the previous frame
+    def advance(self) -> int:
+        now = self.clock.nsecsElapsed()
+        self.carry += (now - self.last_frame) * 1e-9 * self.sample_rate
+        self.last_frame = now
+        step = int(self.carry)
+        self.carry -= step
+        self.samples += step
+        return step
+
+    # Whether this frame is drawn, frames are dropped until the rendering is back within budget
+    def should_render(self) -> bool:
+        if self.debt > 0:
+            self.debt = max(self.debt - self.frame_interval, 0)
+            self.dropped += 1
+            return False
+        self.render_start = self.clock.nsecsElapsed()
+        return True
+
+    # Call after drawing a frame, the time over budget is owed by the next frames
+    def rendered(self):
+        duration = (self.clock.nsecsElapsed() - self.render_start) * 1e-6
+        self.debt += max(duration - self.frame_interval, 0)
+        self.frames += 1
+
+    # Achieved samples per second, frames per second & dropped frames since the last call,
+    # None until `stats_interval` passed
+    def stats(self):
+        now = self.clock.nsecsElapsed()
+        seconds = (now - self.stats_start) * 1e-9
+        if seconds * 1000 < self.stats_interval: return None
+        stats = (self.samples / seconds, self.frames / seconds, self.dropped)
+        self.stats_start = now
+        self.samples = self.frames = self.dropped = 0
+        return stats
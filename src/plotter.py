@@ -6,11 +6,45 @@ from PyQt5.QtCore import *
 # matplotlib
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from matplotlib.figure import Figure
+import numpy as np
+from signal_io import UniformTime
+from render_scheduler import scheduler
+
+# Samples reduced at once when scanning a whole signal, a memory-mapped one is never copied whole
+CHUNK_SIZE = 1 << 20
+
+# Smallest & largest finite values as floats, None when there is none
+def finite_range(values, chunk_size=CHUNK_SIZE):
+    low, high = np.inf, -np.inf
+    for start in range(0, len(values), chunk_size):
+        chunk = np.asarray(values[start:start + chunk_size])
+        if chunk.dtype.kind in "fc":
+            chunk = chunk[np.isfinite(chunk)]
+        if len(chunk) == 0: continue
+        low, high = min(low, float(chunk.min())), max(high, float(chunk.max()))
+    return (low, high) if low <= high else None
+
+# Keep the first & last point of the minimum and maximum of each of `n_buckets` buckets, in their original order
+def minmax_decimate(x, y, n_buckets):
+    n_buckets = max(int(n_buckets), 1)
+    bucket_size = len(y) // n_buckets
+    if bucket_size < 2: return x, y
+
+    n = bucket_size * n_buckets
+    buckets = y[:n].reshape(n_buckets, bucket_size)
+    offsets = np.arange(n_buckets) * bucket_size
+    i_min = buckets.argmin(axis=1) + offsets
+    i_max = buckets.argmax(axis=1) + offsets
+    indices = np.sort(np.stack([i_min, i_max], axis=1), axis=1).ravel()
+
+    # Samples left over after the last full bucket are kept as they are
+    indices = np.concatenate([indices, np.arange(n, len(y))])
+    return x[indices], y[indices]
 
 
 class Plotter(FigureCanvasQTAgg):
 
-    def __init__(self, parent=None, title="Signal Plot", x_axis="x", y_axis="y"):       
+    def __init__(self, parent=None, title="Signal Plot", x_axis="x", y_axis="y", x_lookahead=1.0):       
         self.fig = Figure(facecolor="white")
         self.axes = self.fig.add_subplot(111)
 
@@ -22,6 +56,20 @@ class Plotter(FigureCanvasQTAgg):
         self.set_settings()
         super(Plotter, self).__init__(self.fig)
 
+        # Line created once & updated with `set_data`, it is animated so it is blitted over the cached background
+        self.line, = self.axes.plot([], [], color="#64B5CD", linewidth=2.5, dash_joinstyle='round', dash_capstyle="round", animated=True)
+        self.background = None
+        self.x_lookahead = x_lookahead # Part of a window kept free ahead of scrolling data
+        self.last_x_min = None
+        self.mpl_connect("draw_event", self.on_draw)
+
+        # Full data, the line only holds it decimated to the width of the axes in pixels
+        self.x_data = np.zeros(0)
+        self.y_data = np.zeros(0)
+        self.pyramid = None # Min/max pyramid of the data, when there is one
+        self.axes.callbacks.connect("xlim_changed", self.update_line)
+        self.mpl_connect("resize_event", self.update_line)
+
     def set_settings(self):
         self.axes.spines['top'].set_visible(False)
         self.axes.spines['right'].set_visible(False)
@@ -31,12 +79,85 @@ class Plotter(FigureCanvasQTAgg):
         self.axes.set_facecolor("#EAEAF2")
         self.axes.grid(True, color='w', linestyle='-', which='both', axis='both')
 
-    def plot_signal(self, x, y):
-        self.clear()
-        self.axes.plot(x, y, color="#64B5CD", linewidth=2.5, dash_joinstyle='round', dash_capstyle="round")
-        self.draw_idle()
-        self.blit()
+    def plot_signal(self, x, y, pyramid=None):
+        self.x_data = x if isinstance(x, UniformTime) else np.asarray(x)
+        self.y_data = np.real(y)
+        self.pyramid = pyramid if pyramid is not None and len(pyramid) == len(self.y_data) else None
+        # The pyramid already holds the range of the signal, it is not read again
+        y_range = self.pyramid.value_range() if self.pyramid is not None else None
+        limits_changed = self.update_limits(self.x_data, self.y_data, y_range)
+        self.update_line()
+
+        # Full redraw only when the axes limits change, otherwise blit the line, on the next render tick
+        if limits_changed or self.background is None:
+            scheduler.request_draw(self)
+        else:
+            scheduler.request_blit(self, self.blit_line)
+
+    # Draw the line over the cached background
+    def blit_line(self):
+        if self.background is None:
+            self.draw()
+            return
+        self.restore_region(self.background)
+        self.axes.draw_artist(self.line)
+        self.blit(self.axes.bbox)
+
+    # Recompute limits when the data leaves the view or only fills a small part of it
+    def update_limits(self, x, y, y_range=None) -> bool:
+        x_range = (x.min(), x.max()) if isinstance(x, UniformTime) and len(x) else finite_range(x)
+        y_range = y_range or finite_range(y)
+        if x_range is None or y_range is None: return False
+        x_min, x_max = x_range
+        y_min, y_max = y_range
+        changed = False
+        scrolling = self.last_x_min is not None and x_min > self.last_x_min
+        self.last_x_min = x_min
+
+        x_low, x_high = self.axes.get_xlim()
+        x_span = max(x_max - x_min, 1e-12)
+        if x_min < x_low or x_max > x_high or x_span < 0.25 * (x_high - x_low):
+            if scrolling:
+                # Data moving forward: leave room ahead of it
+                x_high = x_min + x_span * (1 + self.x_lookahead)
+            else:
+                x_high = x_max if x_max > x_min else x_min + 1
+            self.axes.set_xlim(x_min, x_high)
+            changed = True
+
+        y_low, y_high = self.axes.get_ylim()
+        y_span = y_max - y_min if y_max > y_min else max(abs(y_max), 1)
+        if y_min < y_low or y_max > y_high or y_span < 0.25 * (y_high - y_low):
+            margin = 0.05 * y_span
+            self.axes.set_ylim(y_min - margin, y_max + margin)
+            changed = True
+
+        return changed
+
+    # Set the line to the visible part of the data, decimated to 2 points per pixel (on zoom & resize too)
+    def update_line(self, *args):
+        x, y = self.x_data, self.y_data
+        n_pixels = self.axes.bbox.width
+        if len(x) > 2 * n_pixels and x[0] <= x[-1]:
+            x_low, x_high = self.axes.get_xlim()
+            start = max(x.searchsorted(x_low, side="left") - 1, 0)
+            stop = x.searchsorted(x_high, side="right") + 1
+            # The pyramid is only used when its finest buckets are at most half a pixel wide
+            if self.pyramid is not None and self.pyramid.bucket_size(0) <= (stop - start) / (2 * n_pixels):
+                indices, y = self.pyramid.envelope(start, stop, n_pixels)
+                x = x[indices]
+            else:
+                x, y = minmax_decimate(x[start:stop], y[start:stop], n_pixels)
+        self.line.set_data(x, y)
+
+    # Cache the background without the line after every full draw, then draw the line on it
+    def on_draw(self, event):
+        self.background = self.copy_from_bbox(self.axes.bbox)
+        self.axes.draw_artist(self.line)
 
     def clear(self):
-        self.axes.cla()
-        self.set_settings()
\ No newline at end of file
+        self.x_data = np.zeros(0)
+        self.y_data = np.zeros(0)
+        self.pyramid = None
+        self.line.set_data([], [])
+        scheduler.request_draw(self)
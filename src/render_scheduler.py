@@ -0,0 +1,54 @@
+from PyQt5.QtCore import QTimer
+
+class RenderScheduler():
+    """Redraw the canvases marked dirty at most once per tick
+
+    A canvas asks for a full draw or for a blit callback, every request made
+    before the next tick gives a single redraw, a full draw covering a blit.
+    Canvases that are not visible (e.g. in a hidden tab) stay dirty and are
+    drawn by the first tick after they are shown, `wake` starts that tick.
+    """
+
+    def __init__(self, interval:int=16):
+        self.interval = interval # Milliseconds between ticks, about one frame
+        self.timer = None # Created on the first request, once there is a Qt application
+        self.dirty = {} # Canvas -> blit callback, None for a full draw
+
+    # Full redraw of a canvas on the next tick
+    def request_draw(self, canvas):
+        self.dirty[canvas] = None
+        self.wake()
+
+    # Blit of a canvas on the next tick, only the last callback of a canvas is called
+    def request_blit(self, canvas, blit):
+        if canvas in self.dirty and self.dirty[canvas] is None: return
+        self.dirty[canvas] = blit
+        self.wake()
+
+    # Start the next tick if there is something to draw
+    def wake(self):
+        if not self.dirty: return
+        if self.timer is None:
+            self.timer = QTimer()
+            self.timer.setSingleShot(True)
+            self.timer.timeout.connect(self.tick)
+        if not self.timer.isActive():
+            self.timer.start(self.interval)
+
+    # Redraw the visible dirty canvases, the hidden ones wait to be shown
+    def tick(self):
+        dirty, self.dirty = self.dirty, {}
+        for canvas, blit in dirty.items():
+            try:
+                visible = canvas.isVisible()
+            except RuntimeError: # Canvas deleted since its request
+                continue
+            if not visible:
+                self.dirty[canvas] = blit
+            elif blit is None:
+                canvas.draw()
+            else:
+                blit()
+
+# Scheduler shared by every canvas of the app
+scheduler = RenderScheduler()
@@ -0,0 +1,49 @@
+import numpy as np
+
+class RingBuffer():
+    """Fixed capacity circular buffer backed by NumPy
+
+    Every sample is written twice (at `i` and `i + capacity`) so the last `n`
+    samples are always contiguous and can be returned in order as a view
+    without copying or shifting.
+    """
+
+    def __init__(self, capacity:int, dtype=float):
+        self.capacity = int(capacity)
+        self.buffer = np.zeros(2 * self.capacity, dtype=dtype)
+        self.end = 0 # Next write position in [0, capacity)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    # Append one sample
+    def append(self, value):
+        self.buffer[self.end] = value
+        self.buffer[self.end + self.capacity] = value
+        self.end = (self.end + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    # Append a block of samples, only the last `capacity` ones are kept
+    def extend(self, values):
+        values = np.asarray(values)[-self.capacity:]
+        n = len(values)
+        first = min(n, self.capacity - self.end)
+        rest = n - first
+        for offset in (0, self.capacity):
+            self.buffer[self.end + offset:self.end + offset + first] = values[:first]
+            self.buffer[offset:offset + rest] = values[first:]
+        self.end = (self.end + n) % self.capacity
+        self.size = min(self.size + n, self.capacity)
+
+    # Ordered read-only view of the last `n` samples (all of them by default)
+    def view(self, n=None):
+        n = self.size if n is None else min(n, self.size)
+        stop = self.end + self.capacity
+        view = self.buffer[stop - n:stop]
+        view.flags.writeable = False
+        return view
+
+    def clear(self):
+        self.end = 0
+        self.size = 0
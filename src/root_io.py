@@ -0,0 +1,60 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# Extensions of the files zeros & poles are imported from & exported to
+ROOT_EXTENSIONS = (".json", ".csv", ".npz")
+
+# Root types, in the order they are written
+ROOT_KINDS = ("zero", "pole")
+
+# Roots of a file: root type -> (values, conjugate flags), a flagged root also places its conjugate
+def load_roots(path):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        with open(path) as file:
+            data = json.load(file)
+        return {kind: root_arrays([complex(root["real"], root["imag"]) for root in data.get(kind + "s", [])],
+                                  [root.get("conjugate", False) for root in data.get(kind + "s", [])])
+                for kind in ROOT_KINDS}
+    if extension == ".csv":
+        csv_file = pd.read_csv(path)
+        # Empty cells are roots without conjugate, anything but a boolean is rejected
+        conjugate = csv_file["conjugate"].fillna(False) if "conjugate" in csv_file else pd.Series(False, index=csv_file.index)
+        if not conjugate.isin([True, False]).all():
+            raise ValueError(f"Conjugate column of '{path}' must hold True, False or nothing")
+        csv_file["conjugate"] = conjugate.astype(bool)
+        return {kind: root_arrays(rows["real"] + 1j * rows["imag"], rows["conjugate"])
+                for kind in ROOT_KINDS
+                for rows in [csv_file[csv_file["type"] == kind]]}
+    if extension == ".npz":
+        with np.load(path) as data:
+            return {kind: root_arrays(data[kind + "s"], data[kind + "s_conjugate"] if kind + "s_conjugate" in data else False)
+                    for kind in ROOT_KINDS}
+    raise ValueError(f"Unsupported root file '{extension}', expected one of {ROOT_EXTENSIONS}")
+
+# Write roots given as root type -> (values, conjugate flags)
+def save_roots(path, roots):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".json":
+        data = {kind + "s": [{"real": value.real, "imag": value.imag, "conjugate": bool(conjugate)}
+                             for value, conjugate in zip(*roots[kind])]
+                for kind in ROOT_KINDS}
+        with open(path, "w") as file:
+            json.dump(data, file, indent=2)
+    elif extension == ".csv":
+        pd.DataFrame([{"type": kind, "real": value.real, "imag": value.imag, "conjugate": bool(conjugate)}
+                      for kind in ROOT_KINDS for value, conjugate in zip(*roots[kind])],
+                     columns=["type", "real", "imag", "conjugate"]).to_csv(path, index=False)
+    elif extension == ".npz":
+        np.savez(path, **{kind + "s": roots[kind][0] for kind in ROOT_KINDS},
+                 **{kind + "s_conjugate": roots[kind][1] for kind in ROOT_KINDS})
+    else:
+        raise ValueError(f"Unsupported root file '{extension}', expected one of {ROOT_EXTENSIONS}")
+
+# Values & conjugate flags as arrays of the same length
+def root_arrays(values, conjugate=False):
+    values = np.asarray(values, dtype=complex).reshape(-1)
+    conjugate = np.broadcast_to(np.asarray(conjugate, dtype=bool), values.shape).copy()
+    return values, conjugate
@@ -0,0 +1,160 @@
+from collections import defaultdict
+import math
+import numpy as np
+
+class RootGrid():
+    """Uniform grid over the Z plane, each cell holds the keys of the points inside it
+
+    Finding the points around a position only looks at the few cells the
+    region covers, whatever the number of points.
+    """
+
+    def __init__(self, cell:float=0.1):
+        self.cell = cell
+        self.cells = defaultdict(set)
+
+    def cell_of(self, point:complex):
+        return math.floor(point.real / self.cell), math.floor(point.imag / self.cell)
+
+    def insert(self, key, point:complex):
+        self.cells[self.cell_of(point)].add(key)
+
+    def discard(self, key, point:complex):
+        cell = self.cell_of(point)
+        keys = self.cells.get(cell)
+        if keys is None: return
+        keys.discard(key)
+        if not keys:
+            del self.cells[cell]
+
+    # Keys of the cells covering the square of half side `r` around `point`
+    def query(self, point:complex, r:float):
+        x_low, y_low = self.cell_of(complex(point.real - r, point.imag - r))
+        x_high, y_high = self.cell_of(complex(point.real + r, point.imag + r))
+        keys = []
+        for x in range(x_low, x_high + 1):
+            for y in range(y_low, y_high + 1):
+                keys.extend(self.cells.get((x, y), ()))
+        return keys
+
+    def clear(self):
+        self.cells.clear()
+
+class RootStore():
+    """Roots of one type (zeros or poles) of the Z plane held in NumPy arrays
+
+    Every root has a stable id, its slot in `_values`, & a flag in `_conjugate`
+    when it was placed with its conjugate. Slots of removed roots are reused,
+    the arrays grow by doubling so adding a root is amortized O(1). The points
+    drawn for the roots & their conjugates are kept in a `RootGrid`, keyed by
+    `2 * id + is conjugate`, so hit-testing only looks at the roots around the
+    click. The points of those cells are checked at once from the arrays, so
+    many roots in one cell (e.g. all added at 0) do not make it slow.
+    """
+
+    def __init__(self, capacity:int=16, cell:float=0.1):
+        self._values = np.zeros(capacity, dtype=complex)
+        self._conjugate = np.zeros(capacity, dtype=bool)
+        self._alive = np.zeros(capacity, dtype=bool)
+        self.free = list(range(capacity - 1, -1, -1)) # Free slots, taken from the end
+        self.count = 0
+        self.grid = RootGrid(cell)
+
+    def __len__(self):
+        return self.count
+
+    # Ids, values & conjugate flags of the roots, in id order
+    @property
+    def ids(self):
+        return np.flatnonzero(self._alive)
+
+    @property
+    def values(self):
+        return self._values[self._alive]
+
+    @property
+    def conjugate(self):
+        return self._conjugate[self._alive]
+
+    def value(self, i:int) -> complex:
+        return complex(self._values[i])
+
+    def has_conjugate(self, i:int) -> bool:
+        return bool(self._conjugate[i])
+
+    # Drawn points of a root as grid keys & positions: the root & its conjugate when it has one
+    def root_points(self, i:int):
+        i = int(i)
+        value = self.value(i)
+        return [(2 * i, value)] + ([(2 * i + 1, value.conjugate())] if self._conjugate[i] else [])
+
+    # Add roots, returns their ids
+    def extend(self, values, conjugate=False):
+        values = np.atleast_1d(np.asarray(values, dtype=complex))
+        conjugate = np.broadcast_to(np.asarray(conjugate, dtype=bool), values.shape)
+        if len(values) > len(self.free):
+            capacity = len(self._values)
+            new_capacity = max(2 * capacity, capacity + len(values) - len(self.free))
+            self._values = np.resize(self._values, new_capacity)
+            self._conjugate = np.resize(self._conjugate, new_capacity)
+            self._alive = np.concatenate([self._alive, np.zeros(new_capacity - capacity, dtype=bool)])
+            self.free = list(range(new_capacity - 1, capacity - 1, -1)) + self.free
+
+        ids = np.array([self.free.pop() for _ in range(len(values))], dtype=int)
+        self._values[ids] = values
+        self._conjugate[ids] = conjugate
+        self._alive[ids] = True
+        self.count += len(ids)
+        for i in ids:
+            for key, point in self.root_points(i):
+                self.grid.insert(key, point)
+        return ids
+
+    def add(self, value:complex, conjugate:bool=False) -> int:
+        return int(self.extend([value], conjugate)[0])
+
+    def move(self, i:int, value:complex):
+        for key, point in self.root_points(i):
+            self.grid.discard(key, point)
+        self._values[i] = value
+        for key, point in self.root_points(i):
+            self.grid.insert(key, point)
+
+    def remove(self, ids):
+        for i in np.atleast_1d(ids):
+            if not self._alive[i]: continue
+            for key, point in self.root_points(i):
+                self.grid.discard(key, point)
+            self._alive[i] = False
+            self.free.append(int(i))
+            self.count -= 1
+
+    def clear(self):
+        self._alive[:] = False
+        self.free = list(range(len(self._values) - 1, -1, -1))
+        self.count = 0
+        self.grid.clear()
+
+    # Every root, the conjugates of the flagged ones after the placed roots
+    def roots(self) -> np.ndarray:
+        values = self.values
+        return np.concatenate([values, np.conj(values[self.conjugate])])
+
+    # Coordinates of the drawn points, the root `hidden` is left out
+    def points(self, hidden=None):
+        alive = self._alive.copy()
+        if hidden is not None:
+            alive[hidden] = False
+        values = self._values[alive]
+        roots = np.concatenate([values, np.conj(values[self._conjugate[alive]])])
+        return roots.real, roots.imag
+
+    # Points in the square of half side `r` around `point`, nearest first, as arrays of ids & is conjugate flags
+    def query(self, point:complex, r:float):
+        keys = self.grid.query(point, r)
+        keys = np.fromiter(keys, dtype=int, count=len(keys))
+        ids, is_conjugate = keys >> 1, (keys & 1).astype(bool)
+        positions = np.where(is_conjugate, np.conj(self._values[ids]), self._values[ids])
+        inside = (np.abs(positions.real - point.real) <= r) & (np.abs(positions.imag - point.imag) <= r)
+        order = np.argsort(np.abs(positions[inside] - point), kind="stable")
+        return ids[inside][order], is_conjugate[inside][order]
@@ -0,0 +1,148 @@
+import json
+import os
+import numpy as np
+import pandas as pd
+from scipy.io import wavfile
+
+# Extensions that can be opened, the binary ones are memory-mapped
+SIGNAL_EXTENSIONS = (".csv", ".npy", ".npz", ".wav", ".raw", ".bin")
+
+# Rows of a CSV parsed at once when it is read in chunks
+CSV_CHUNK_SIZE = 100_000
+
+# Header of self-described raw files: magic, dtype string, channels, sample rate
+RAW_MAGIC = b"RSIG"
+RAW_HEADER = np.dtype([("magic", "S4"), ("dtype", "S8"), ("channels", "<u4"), ("sample_rate", "<f8")])
+
+class UniformTime():
+    """Time axis of a uniformly sampled signal, computed on access instead of stored
+
+    Supports what the plots need from a time array: length, indexing, slicing,
+    `searchsorted`, `min` & `max`.
+    """
+
+    def __init__(self, length:int, sample_rate:float=1.0, start:float=0.0):
+        self.length = int(length)
+        self.sample_rate = float(sample_rate)
+        self.start = float(start)
+
+    def __len__(self):
+        return self.length
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return self.start + np.arange(*key.indices(self.length)) / self.sample_rate
+        if np.isscalar(key):
+            key = key + self.length if key < 0 else key
+            if not 0 <= key < self.length:
+                raise IndexError("time index out of range")
+            return self.start + key / self.sample_rate
+        # Index arrays give the times of their indices only, the whole axis is never built
+        key = np.asarray(key)
+        if key.dtype == bool:
+            key = np.flatnonzero(key)
+        if np.any((key < -self.length) | (key >= self.length)):
+            raise IndexError("time index out of range")
+        return self.start + np.where(key < 0, key + self.length, key) / self.sample_rate
+
+    def __array__(self, dtype=None, copy=None):
+        return self[:].astype(dtype) if dtype else self[:]
+
+    def searchsorted(self, value, side="left"):
+        position = (np.asarray(value) - self.start) * self.sample_rate
+        index = np.ceil(position) if side == "left" else np.floor(position) + 1
+        return np.clip(index, 0, self.length).astype(int)
+
+    def min(self):
+        return self[0]
+
+    def max(self):
+        return self[-1]
+
+# Load time & signal arrays of a file, binary files are memory-mapped so pages are read when accessed
+def load_signal(path, dtype=np.float64):
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return load_csv(path, dtype)
+    if extension == ".npy":
+        return split_columns(np.load(path, mmap_mode="r"))
+    if extension == ".npz":
+        return load_npz(path)
+    if extension == ".wav":
+        sample_rate, data = wavfile.read(path, mmap=True)
+        return split_columns(data, sample_rate, time_column=False)
+    if extension in (".raw", ".bin"):
+        return load_raw(path)
+    raise ValueError(f"Unsupported signal file '{extension}', expected one of {SIGNAL_EXTENSIONS}")
+
+# Time in the first column & signal in the second one
+def load_csv(path, dtype=np.float64):
+    names, dtypes = csv_columns(path, dtype)
+    csv_file = pd.read_csv(path, usecols=names, dtype=dtypes, engine="c")
+    return csv_file[names[0]].to_numpy(), csv_file[names[1]].to_numpy()
+
+# Read the time & signal columns of a CSV `chunksize` rows at a time
+# Yields time, signal & the part of the file read so far
+def iter_csv_chunks(path, dtype=np.float64, chunksize=CSV_CHUNK_SIZE):
+    names, dtypes = csv_columns(path, dtype)
+    size = max(os.path.getsize(path), 1)
+    with open(path, "rb") as file:
+        for chunk in pd.read_csv(file, usecols=names, dtype=dtypes, engine="c", chunksize=chunksize):
+            yield chunk[names[0]].to_numpy(), chunk[names[1]].to_numpy(), min(file.tell() / size, 1.0)
+
+# Names of the first two columns & their types, only these are parsed
+def csv_columns(path, dtype=np.float64):
+    names = list(pd.read_csv(path, nrows=0).columns[:2])
+    if len(names) < 2:
+        raise ValueError(f"'{path}' must have a time column and a signal column")
+    return names, {names[0]: np.float64, names[1]: dtype}
+
+# Arrays `time` (optional), `signal` (or the first array) & `sample_rate` (optional), not mapped since npz is zipped
+def load_npz(path):
+    with np.load(path) as arrays:
+        signal = arrays["signal"] if "signal" in arrays.files else arrays[arrays.files[0]]
+        sample_rate = float(arrays["sample_rate"]) if "sample_rate" in arrays.files else 1.0
+        if "time" in arrays.files:
+            return arrays["time"], signal
+    return split_columns(signal, sample_rate, time_column=False)
+
+# Interleaved binary samples described by a `<path>.json` sidecar or a `RAW_HEADER` at the start of the file
+# Sidecar keys: dtype, channels, channel, sample_rate & offset (bytes before the samples)
+def load_raw(path):
+    sidecar = f"{path}.json"
+    if os.path.exists(sidecar):
+        with open(sidecar) as file:
+            description = json.load(file)
+    else:
+        header = np.fromfile(path, dtype=RAW_HEADER, count=1)
+        if len(header) == 0 or header["magic"][0] != RAW_MAGIC:
+            raise ValueError(f"Raw signal '{path}' has neither a header nor a '{sidecar}' sidecar")
+        description = {"dtype": header["dtype"][0].decode(),
+                       "channels": int(header["channels"][0]),
+                       "sample_rate": float(header["sample_rate"][0]),
+                       "offset": RAW_HEADER.itemsize}
+
+    dtype = np.dtype(description.get("dtype", "<f8"))
+    channels = int(description.get("channels", 1))
+    offset = int(description.get("offset", 0))
+    n_frames = (os.path.getsize(path) - offset) // (dtype.itemsize * channels)
+    data = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(n_frames, channels))
+    channel = int(description.get("channel", 0))
+    return UniformTime(n_frames, description.get("sample_rate", 1.0)), data[:, channel]
+
+# Write samples as a raw file with a `RAW_HEADER`
+def save_raw(path, data, sample_rate=1.0):
+    data = np.asarray(data)
+    channels = 1 if data.ndim == 1 else data.shape[1]
+    header = np.array([(RAW_MAGIC, data.dtype.str.encode(), channels, sample_rate)], dtype=RAW_HEADER)
+    with open(path, "wb") as file:
+        header.tofile(file)
+        data.tofile(file)
+
+# (N,) arrays are the signal, (N, 2) arrays hold time & signal unless `time_column` is False (first channel used)
+def split_columns(data, sample_rate=1.0, time_column=True):
+    if data.ndim == 1:
+        return UniformTime(len(data), sample_rate), data
+    if time_column and data.shape[1] == 2:
+        return data[:, 0], data[:, 1]
+    return UniformTime(len(data), sample_rate), data[:, 0]
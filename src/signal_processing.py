@@ -1,18 +1,316 @@
+from collections import Counter, OrderedDict
 from scipy import signal
 import numpy as np
 
 K = 1
-def filter_signal(digital_signal, z, p, k=K) -> []:
-    numerator , denominator = signal.zpk2tf(z, p, K)
-    filtered_signal = signal.lfilter(numerator, denominator, digital_signal)
+ENGINES = ("sos", "tf")
+WARMUP = 4096 # Samples filtered to warm up a state that can not be reused
+
+def filter_signal(digital_signal, z, p, k=K, engine="sos") -> []:
+    if engine == "tf":
+        numerator , denominator = signal.zpk2tf(z, p, k)
+        filtered_signal = signal.lfilter(numerator, denominator, digital_signal)
+    elif engine == "sos":
+        filtered_signal = signal.sosfilt(zpk_to_sos(z, p, k), digital_signal)
+    else:
+        raise ValueError(f"Unknown filtering engine '{engine}', expected one of {ENGINES}")
     return filtered_signal
 
+# Split roots into conjugate pairs, real pairs & leftover complex pairs (padded with roots at origin)
+def pair_roots(roots, tol=1e-9) -> []:
+    roots = np.atleast_1d(np.asarray(roots, dtype=complex)).ravel()
+    is_real = np.abs(roots.imag) <= tol * np.maximum(1, np.abs(roots))
+    reals = np.sort(roots[is_real].real).astype(complex)
+    upper = roots[~is_real & (roots.imag > 0)]
+    lower = roots[~is_real & (roots.imag < 0)]
+
+    pairs = []
+    unmatched = []
+    lower_taken = np.zeros(len(lower), dtype=bool)
+    for root in upper:
+        distances = np.abs(lower - np.conj(root))
+        distances[lower_taken] = np.inf
+        i = np.argmin(distances) if len(lower) else None
+        if i is not None and distances[i] <= tol * max(1, abs(root)):
+            lower_taken[i] = True
+            pairs.append((root, np.conj(root)))
+        else:
+            unmatched.append(root)
+    unmatched = np.sort_complex(np.concatenate([unmatched, lower[~lower_taken]]).astype(complex))
+
+    # Consecutive real roots and consecutive unmatched complex roots share a section
+    for leftovers in (reals, unmatched):
+        for i in range(0, len(leftovers), 2):
+            pair = leftovers[i:i+2]
+            pairs.append((pair[0], pair[1] if len(pair) > 1 else 0j))
+    return pairs
+
+# Convert zeros, poles & gain to second-order sections (biquads) for `sosfilt`
+def zpk_to_sos(z, p, k=K):
+    zero_pairs = pair_roots(z)
+    pole_pairs = pair_roots(p)
+
+    # Poles closest to the unit circle go last, each one takes the nearest remaining zero pair
+    pole_pairs.sort(key=lambda pair: max(abs(pair[0]), abs(pair[1])))
+    n_sections = max(len(zero_pairs), len(pole_pairs), 1)
+    pole_pairs += [(0j, 0j)] * (n_sections - len(pole_pairs))
+    zero_pairs += [(0j, 0j)] * (n_sections - len(zero_pairs))
+
+    sections = []
+    for pole_pair in pole_pairs:
+        center = (pole_pair[0] + pole_pair[1]) / 2
+        i = min(range(len(zero_pairs)), key=lambda j: abs((zero_pairs[j][0] + zero_pairs[j][1]) / 2 - center))
+        zero_pair = zero_pairs.pop(i)
+        sections.append(np.concatenate([np.poly(zero_pair), np.poly(pole_pair)]))
+
+    sos = np.array(sections, dtype=complex)
+    sos[0, :3] *= k
+    if np.all(np.abs(sos.imag) <= 1e-12 * np.maximum(1, np.abs(sos.real))):
+        sos = sos.real.copy()
+    return sos
+
+# Filter that keeps the per-section state between `process` calls so a signal can be fed block by block
+class StreamingFilter():
+    def __init__(self, z=[], p=[], k=K):
+        self.set_design(z, p, k)
+
+    # Change zeros, poles & gain, the state is cleared since the sections are different
+    def set_design(self, z, p, k=K):
+        self.sos = zpk_to_sos(z, p, k)
+        self.reset()
+
+    # Back to zero initial conditions
+    def reset(self):
+        self.zi = np.zeros((self.sos.shape[0], 2), dtype=np.result_type(self.sos, float))
+
+    def get_state(self):
+        return self.zi.copy()
+
+    def set_state(self, zi):
+        self.zi = np.array(zi, dtype=np.result_type(zi, self.sos, float))
+
+    # Filter the next block of the stream
+    def process(self, chunk):
+        chunk = np.asarray(chunk)
+        if chunk.size == 0:
+            return np.zeros(0, dtype=np.result_type(chunk, self.zi))
+        if np.iscomplexobj(chunk) and not np.iscomplexobj(self.zi):
+            self.zi = self.zi.astype(complex)
+        filtered_chunk, self.zi = signal.sosfilt(self.sos, chunk, zi=self.zi)
+        return filtered_chunk
+
+# Put `streaming_filter` in its state at `position` of the signal: the saved state `zi` when it fits
+# the sections of the filter, else the state reached by filtering the `warmup` samples before `position`
+def warm_start(streaming_filter, digital_signal, position, zi=None, warmup=WARMUP):
+    if zi is not None and np.shape(zi) == streaming_filter.zi.shape:
+        streaming_filter.set_state(zi)
+    else:
+        streaming_filter.reset()
+        streaming_filter.process(digital_signal[max(position - warmup, 0):position])
+
+class FilterCheckpoints():
+    """Filter states saved every `interval` samples of a signal
+
+    States are kept in one (checkpoints, sections, 2) array with a flag per
+    checkpoint, so any sample can be filtered again from the closest saved
+    checkpoint before it instead of from the start of the signal.
+    """
+
+    def __init__(self, length:int, n_sections:int, interval:int=4096, dtype=np.float64):
+        self.interval = interval
+        self.states = np.zeros((-(-length // interval), n_sections, 2), dtype=dtype)
+        self.saved = np.zeros(len(self.states), dtype=bool)
+
+    def __len__(self):
+        return len(self.states)
+
+    # Save the state at the start of checkpoint `i`, real states become complex for complex sections
+    def save(self, i:int, zi):
+        if np.iscomplexobj(zi) and not np.iscomplexobj(self.states):
+            self.states = self.states.astype(complex)
+        self.states[i] = zi
+        self.saved[i] = True
+
+    # State at the start of checkpoint `i`, None if it was not saved
+    def get(self, i:int):
+        return self.states[i].copy() if 0 <= i < len(self) and self.saved[i] else None
+
+    # Last saved checkpoint at or before `position`, -1 if there is none
+    def nearest(self, position:int) -> int:
+        i = min(position // self.interval, len(self) - 1)
+        saved = np.flatnonzero(self.saved[:i + 1])
+        return int(saved[-1]) if len(saved) else -1
+
+    # Forget every checkpoint, e.g. when the design changed
+    def clear(self):
+        self.saved[:] = False
+
+# Filtered signal computed block by block when it is read, only the last `cache_blocks` blocks are kept
+# The filter state at every block start is checkpointed, a block behind the filter is filtered from there
+# A block more than `max_gap` blocks ahead of the filter state & of every checkpoint is warm-started instead,
+# so reading any position (e.g. a seek) costs the same wherever it is
+class LazyFilteredSignal():
+    def __init__(self, digital_signal, z=[], p=[], k=K, dtype=np.float64, block_size=4096, cache_blocks=8, max_gap=8):
+        self.signal = digital_signal
+        self.dtype = dtype
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.max_gap = max_gap
+        self.filter = StreamingFilter(z, p, k)
+        self.design = (list(z), list(p), k)
+        self.checkpoints = FilterCheckpoints(len(digital_signal), self.filter.zi.shape[0], block_size)
+        self.cache = OrderedDict() # Block index -> filtered block
+        self.next_block = 0 # Block the filter state is at
+
+    def __len__(self):
+        return len(self.signal)
+
+    # Filtered samples of a slice
+    def __getitem__(self, key:slice):
+        start, stop, step = key.indices(len(self))
+        if stop <= start:
+            return np.zeros(0, dtype=self.dtype)
+        first, last = start // self.block_size, (stop - 1) // self.block_size
+        samples = np.concatenate([self.block(i) for i in range(first, last + 1)])
+        offset = first * self.block_size
+        return samples[start - offset:stop - offset:step]
+
+    # New zeros, poles & gain, everything is filtered again from the start
+    # With a `position`, blocks before the one holding it are kept & filtering restarts from that block,
+    # warm-started from the state saved at its start
+    def set_design(self, z, p, k=K, position=None):
+        i = 0 if position is None else min(position, len(self) - 1) // self.block_size
+        zi = self.filter.get_state() if i == self.next_block else self.checkpoints.get(i)
+        for j in [j for j in self.cache if j >= i]:
+            del self.cache[j]
+
+        # Checkpoints of the previous design can not restart the new one, only the warm start is saved
+        self.filter.set_design(z, p, k)
+        self.design = (list(z), list(p), k)
+        self.checkpoints = FilterCheckpoints(len(self), self.filter.zi.shape[0], self.block_size)
+        if i > 0:
+            warm_start(self.filter, self.signal, i * self.block_size, zi)
+            self.checkpoints.save(i, self.filter.get_state())
+        self.next_block = i
+
+    def has_design(self, z, p, k=K):
+        return self.design == (list(z), list(p), k)
+
+    # Filter state at the start of block `i` from the `WARMUP` samples before it, exact for the first block
+    def warm_start(self, i):
+        warm_start(self.filter, self.signal, i * self.block_size)
+        self.next_block = i
+
+    # Filter blocks up to the one holding `position` so they are ready before they are read
+    def prefetch(self, position):
+        self.block(min(position, len(self) - 1) // self.block_size)
+
+    # Filtered block, the filter runs forward from its state or from the last checkpoint before the block,
+    # whichever is closer, or is warm-started at the block when both are more than `max_gap` blocks behind it
+    def block(self, i):
+        if i in self.cache:
+            self.cache.move_to_end(i)
+            return self.cache[i]
+
+        checkpoint = self.checkpoints.nearest(i * self.block_size)
+        if i < self.next_block or checkpoint > self.next_block:
+            if checkpoint >= 0 and i - checkpoint <= self.max_gap:
+                self.filter.set_state(self.checkpoints.get(checkpoint))
+                self.next_block = checkpoint
+            else:
+                self.warm_start(i)
+        elif i - self.next_block > self.max_gap:
+            self.warm_start(i)
+        while self.next_block <= i:
+            start = self.next_block * self.block_size
+            chunk = self.signal[start:start + self.block_size]
+            self.checkpoints.save(self.next_block, self.filter.get_state())
+            self.cache[self.next_block] = np.real(self.filter.process(chunk)).astype(self.dtype, copy=False)
+            self.cache.move_to_end(self.next_block)
+            self.next_block += 1
+            if len(self.cache) > self.cache_blocks:
+                self.cache.popitem(last=False)
+        return self.cache[i]
+
 def get_frequency_response(z, p, k=K):
     w, h = signal.freqz_zpk(z, p, k)
     magnitude = 20 * np.log10(np.abs(h)) # convert from hz into decibels
     phase = np.unwrap(np.angle(h))   # `np.unwrap` to remove phase discontinuities
-    
+
     if z == [[0j]] or p == [[0j]]:
         magnitude = np.zeros(len(phase))
 
     return w, magnitude, phase
+
+class FrequencyResponse():
+    """Frequency response of a design updated root by root
+
+    H(e^jw) is cached as the sums over the roots of log|e^jw - root| & of the
+    angle of e^jw - root, zeros added & poles subtracted. A new design is
+    compared with the cached roots, only the factors of the roots that changed
+    are divided out & multiplied in, so moving a root costs O(frequencies)
+    whatever the order. The sums are recomputed from scratch every
+    `refresh_interval` updates to stop the rounding errors from adding up, &
+    when a changed root is so close to the unit circle that its factor can not
+    be divided out.
+    """
+
+    def __init__(self, k=K, n_points:int=512, refresh_interval:int=256, tol:float=1e-9):
+        self.k = k
+        self.w = np.pi * np.arange(n_points) / n_points # Frequencies of `signal.freqz_zpk`
+        self.unit_circle = np.exp(1j * self.w)
+        self.refresh_interval = refresh_interval
+        self.tol = tol # Smallest |e^jw - root| of a factor that can be divided out
+        self.roots = {1: Counter(), -1: Counter()} # Cached roots, zeros (+1) & poles (-1), with their multiplicity
+        self.log_magnitude = np.zeros(n_points)
+        self.angle = np.zeros(n_points)
+        self.updates = 0 # Incremental updates since the last full computation
+        self.full_computations = 0
+        self.incremental_updates = 0
+
+    # Frequencies, magnitude (dB) & unwrapped phase of the design, like `get_frequency_response`
+    def update(self, z, p):
+        new_roots = {1: Counter(z), -1: Counter(p)}
+        changes = [(sign, roots, -1) for sign in (1, -1) for roots in [self.roots[sign] - new_roots[sign]]] + \
+                  [(sign, roots, 1) for sign in (1, -1) for roots in [new_roots[sign] - self.roots[sign]]]
+        changed = sum(sum(roots.values()) for _, roots, _ in changes)
+        order = len(z) + len(p)
+
+        if self.updates >= self.refresh_interval or 2 * changed > order or not self.apply(changes):
+            self.compute(z, p)
+        self.roots = new_roots
+
+        magnitude = 20 * np.log10(np.abs(self.k)) + 20 / np.log(10) * self.log_magnitude
+        phase = np.unwrap(np.angle(np.exp(1j * (np.angle(self.k) + self.angle))))
+        return self.w, magnitude, phase
+
+    # Full computation of the sums over every root
+    def compute(self, z, p):
+        self.log_magnitude[:] = 0
+        self.angle[:] = 0
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for sign, roots in ((1, z), (-1, p)):
+                if len(roots) == 0: continue
+                factors = self.unit_circle[:, None] - np.asarray(roots, dtype=complex)[None, :]
+                self.log_magnitude += sign * np.log(np.abs(factors)).sum(axis=1)
+                self.angle += sign * np.angle(factors).sum(axis=1)
+        self.updates = 0
+        self.full_computations += 1
+
+    # Divide out (-1) or multiply in (+1) the factors of the changed roots
+    # False if a factor to divide out is too close to zero, the sums are then left as they were
+    def apply(self, changes) -> bool:
+        factors = []
+        for sign, roots, direction in changes:
+            for root, count in roots.items():
+                factor = self.unit_circle - root
+                if np.abs(factor).min() < self.tol:
+                    return False
+                factors.append((sign * direction * count, factor))
+
+        for weight, factor in factors:
+            self.log_magnitude += weight * np.log(np.abs(factor))
+            self.angle += weight * np.angle(factor)
+        self.updates += 1
+        self.incremental_updates += 1
+        return True
@@ -0,0 +1,158 @@
+# PyQt5 thread pool workers
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+import threading
+import numpy as np
+
+from signal_io import load_signal, iter_csv_chunks
+from minmax_pyramid import MinMaxPyramid, sidecar_path
+from signal_processing import StreamingFilter, FilterCheckpoints, warm_start
+
+# Samples filtered per block by `FilterWorker`, block starts are its checkpoints
+BLOCK_SIZE = 1 << 16
+
+# Signals of a worker, a QRunnable can not emit signals itself
+class WorkerSignals(QObject):
+    progress = pyqtSignal(float) # Part of the work done in [0, 1]
+    partial = pyqtSignal(object) # Data (or amount of it) available before the end
+    finished = pyqtSignal(object) # Result, also sent when cancelled with what was done
+    error = pyqtSignal(str)
+
+class LoadWorker(QRunnable):
+    """Load a signal file & its min/max pyramid on a thread of the pool
+
+    CSVs are parsed in chunks: the first one is sent with `partial` so it can be
+    shown right away. Memory-mapped files are sent whole with `partial` before
+    their pyramid is loaded or built. `finished` sends (time, signal, pyramid,
+    complete), a cancelled load sends what was parsed with `complete` False and
+    no pyramid.
+    """
+
+    def __init__(self, path, dtype=np.float64, save_pyramid=False):
+        super(LoadWorker, self).__init__()
+        self.setAutoDelete(False) # Owned by the app, the pool never deletes it while it is referenced
+        self.path = path
+        self.dtype = dtype
+        self.save_pyramid = save_pyramid
+        self.cancelled = False
+        self.signals = WorkerSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            if self.path.lower().endswith(".csv"):
+                time, signal = self.load_csv()
+            else:
+                # Binary files are memory-mapped & keep their own type, they are shown before the pyramid is ready
+                time, signal = load_signal(self.path, self.dtype)
+                self.signals.partial.emit((time, signal))
+            complete = not self.cancelled
+            pyramid = self.load_pyramid(signal) if complete else None
+            self.signals.finished.emit((time, signal, pyramid, complete))
+        except Exception as e:
+            self.signals.error.emit(str(e))
+
+    # Parse the CSV chunk by chunk until it ends or the load is cancelled
+    def load_csv(self):
+        chunks = []
+        for time, signal, progress in iter_csv_chunks(self.path, self.dtype):
+            chunks.append((time, signal))
+            if len(chunks) == 1:
+                self.signals.partial.emit((time, signal))
+            self.signals.progress.emit(progress)
+            if self.cancelled: break
+
+        if not chunks:
+            return np.zeros(0), np.zeros(0, dtype=self.dtype)
+        time = np.concatenate([time for time, _ in chunks])
+        signal = np.concatenate([signal for _, signal in chunks])
+        return time, signal
+
+    # Min/Max Pyramid, from its sidecar file when it is up to date
+    def load_pyramid(self, signal):
+        pyramid = MinMaxPyramid.load(sidecar_path(self.path), source=self.path)
+        if pyramid is None or len(pyramid) != len(signal):
+            pyramid = MinMaxPyramid(signal)
+            if self.save_pyramid:
+                pyramid.save(sidecar_path(self.path), source=self.path)
+        return pyramid
+
+class FilterWorker(QRunnable):
+    """Filter a signal block by block on a thread of the pool
+
+    The output array is allocated up front & filled in place, `partial` sends
+    how many samples are ready after every block so playback can start after
+    the first one. `finished` sends (output, pyramid, complete).
+
+    The filter state at the start of every block is saved in `checkpoints`.
+    Passing the `output` & `checkpoints` of a previous worker with a `start`
+    refilters from there only, warm-started from the state saved at the block
+    start before it. The checkpoints before `start` are dropped since they
+    belong to the previous design. Filtering ends at `stop` (the end of the
+    signal by default), a worker with the `output`, `checkpoints` & final state
+    `zi` of the previous one continues the same design from its `stop`.
+    """
+
+    def __init__(self, signal, z, p, dtype=np.float64, block_size=BLOCK_SIZE, output=None, checkpoints=None, start=0, stop=None, zi=None):
+        super(FilterWorker, self).__init__()
+        self.setAutoDelete(False) # Owned by the app, the pool never deletes it while it is referenced
+        self.signal = signal
+        self.z = z
+        self.p = p
+        self.block_size = block_size
+        self.output = output if output is not None else np.zeros(len(signal), dtype=dtype)
+        self.start = start
+        self.stop = len(signal) if stop is None else min(stop, len(signal))
+        self.filter = StreamingFilter(z, p)
+        self.zi = zi
+        if zi is not None and checkpoints is not None:
+            self.previous_checkpoints = None
+            self.checkpoints = checkpoints
+        else:
+            self.previous_checkpoints = checkpoints
+            self.checkpoints = FilterCheckpoints(len(signal), self.filter.zi.shape[0], block_size)
+        self.cancelled = False
+        self.done = threading.Event() # Set when the worker stops writing to the output, before the pyramid is built
+        self.signals = WorkerSignals()
+
+    def cancel(self):
+        self.cancelled = True
+
+    def run(self):
+        try:
+            self.warm_start()
+            # First chunk ends at the next block start so checkpoints stay at block starts
+            start = self.start
+            while start < self.stop:
+                if self.cancelled: break
+                if start % self.block_size == 0:
+                    self.checkpoints.save(start // self.block_size, self.filter.get_state())
+                stop = min((start // self.block_size + 1) * self.block_size, self.stop)
+                self.output[start:stop] = np.real(self.filter.process(self.signal[start:stop]))
+                start = stop
+                self.signals.partial.emit(stop)
+                self.signals.progress.emit((stop - self.start) / max(self.stop - self.start, 1))
+        except Exception as e:
+            self.signals.error.emit(str(e))
+            return
+        finally:
+            self.done.set()
+
+        # The output is complete up to the end, its pyramid is built without keeping a refilter waiting
+        if self.cancelled or self.stop < len(self.signal):
+            self.signals.finished.emit((self.output, None, False))
+        else:
+            self.signals.finished.emit((self.output, MinMaxPyramid(self.output), True))
+
+    # Filter state at `start`: the given one, else the state saved at the block start before it
+    # (or the `WARMUP` samples before that block) carried up to `start`
+    def warm_start(self):
+        if self.zi is not None:
+            self.filter.set_state(self.zi)
+            return
+        i = self.start // self.block_size
+        zi = self.previous_checkpoints.get(i) if self.previous_checkpoints is not None else None
+        if i * self.block_size > 0:
+            warm_start(self.filter, self.signal, i * self.block_size, zi)
+        self.filter.process(self.signal[i * self.block_size:self.start])
@@ -4,6 +4,7 @@
 
 # math & matrix computations library
 import random
+from contextlib import contextmanager
 import numpy as np
 
 # Matplotlib
@@ -12,8 +13,9 @@ from  matplotlib import patches
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 from collections import defaultdict
-from matplotlib.backend_bases import PickEvent
-from zplane_object import Zplane_Object
+from PyQt5.QtCore import QTimer
+from root_store import RootStore
+from render_scheduler import scheduler
 
 matplotlib.use('Qt5Agg')
 
@@ -31,12 +33,26 @@ class Zplane(FigureCanvasQTAgg):
         
         # Variables
         self.title = title
-        self.zeros = []
-        self.poles = []
+        self.zeros = RootStore()
+        self.poles = RootStore()
         self.allpass = []
 
-        self.dragged = None
-        self.dragged_conjugate = None
+        self.dragged = None # Kind, id & whether the conjugate point is the one dragged
+        self.hit_radius = 0.045 # Half side of the square around a click where roots are hit
+        self.background = None # Static content (grid, unit circle, roots) cached after every full draw
+
+        # Motion events are coalesced, the latest one is processed at most once per frame
+        self.pending_motion = None
+        self.motion_timer = QTimer()
+        self.motion_timer.setSingleShot(True)
+        self.motion_timer.timeout.connect(self.process_motion)
+        self.motion_received = 0
+        self.motion_processed = 0
+
+        # Draw & callback held back while a transaction is open, done once when it ends
+        self.transaction_depth = 0
+        self.pending_draw = False
+        self.pending_callback = None # Arguments of the last callback held back
         self.callback_function = callback_function
         if callback_function is None:
             self.callback_function = self.none_function
@@ -68,16 +84,27 @@ class Zplane(FigureCanvasQTAgg):
         self.axes.set_title(self.title, title_style)
         
         if self.axis_exist:
-            self.vertical_line   = self.axes.axvline(0, color='k', lw=0.6, ls='--')
-            self.horizontal_line = self.axes.axhline(0, color='k', lw=0.6, ls='--')
+            # Crosshair artists are animated, they are blitted over the background on every mouse move
+            self.vertical_line   = self.axes.axvline(0, color='k', lw=0.6, ls='--', animated=True)
+            self.horizontal_line = self.axes.axhline(0, color='k', lw=0.6, ls='--', animated=True)
 
         
         if self.axis_exist:
             coord_style = {'fontsize': 14,
                         'fontweight' : 500,
                         'verticalalignment': 'top'}
-            self.i_text = self.axes.text(0.22, 0.9, '', transform=self.axes.transAxes, fontdict=coord_style)
-            self.j_text = self.axes.text(0.72, 0.9, '', transform=self.axes.transAxes, fontdict=coord_style)
+            self.i_text = self.axes.text(0.22, 0.9, '', transform=self.axes.transAxes, fontdict=coord_style, animated=True)
+            self.j_text = self.axes.text(0.72, 0.9, '', transform=self.axes.transAxes, fontdict=coord_style, animated=True)
+
+        # One artist per root type, its points are set from the root store
+        root_style = {'markersize': 10, 'alpha': 0.9, 'color': 'none', 'linestyle': 'none'}
+        # Roots are hit-tested with the spatial index of their store, not with matplotlib picking
+        self.root_lines = {"zero": self.axes.plot([], [], 'o', markeredgecolor='red', **root_style)[0],
+                           "pole": self.axes.plot([], [], 'x', markeredgecolor='blue', **root_style)[0]}
+
+        # Dragged root & its conjugate, animated so they move over the background
+        self.dragged_line = self.axes.plot([], [], 'o', markeredgecolor='black', animated=True, **root_style)[0]
+        self.dragged_conjugate_line = self.axes.plot([], [], 'o', markeredgecolor='green', animated=True, **root_style)[0]
 
         # create the unit circle
         unit_circle = patches.Circle((0,0), radius=1, fill=False,
@@ -104,134 +131,167 @@ class Zplane(FigureCanvasQTAgg):
         self.i_text.set_visible(visible)
         self.j_text.set_visible(visible)
 
+    # Artists drawn over the background: the crosshair & the dragged roots
+    def get_animated_artists(self):
+        artists = [self.horizontal_line, self.vertical_line, self.i_text, self.j_text] if self.axis_exist else []
+        return artists + ([self.dragged_line, self.dragged_conjugate_line] if self.dragged is not None else [])
+
+    # Cache the background after every full draw, then draw the animated artists on it
+    def on_draw(self, event):
+        self.background = self.copy_from_bbox(self.fig.bbox)
+        [self.axes.draw_artist(artist) for artist in self.get_animated_artists()]
+
+    # Restore the background & draw only the animated artists
+    def blit_animated(self):
+        if self.background is None:
+            self.draw()
+            return
+        self.restore_region(self.background)
+        [self.axes.draw_artist(artist) for artist in self.get_animated_artists()]
+        self.blit(self.fig.bbox)
+
     # Functions
-    ## Check if click in region of item
-    def in_region(self, x, y, r, click):
-        return (x-r <= click.xdata <= x+r) and (y-r <= click.ydata <= y+r)
-    
-    def get_obj_conj(self, obj):
-        conj = None
-        for zero in self.zeros:
-            if zero.get_original_object() == obj:
-                conj = zero.get_conjugate_object()
-            if zero.get_conjugate_object() == obj:
-                conj = zero.get_original_object()
-
-        for pole in self.poles:
-            if pole.get_original_object() == obj:
-                conj = pole.get_conjugate_object()
-            if pole.get_conjugate_object() == obj:
-                conj = pole.get_original_object()
-
-        return conj
-        
+    ## Store of a root type
+    def get_store(self, kind:str) -> RootStore:
+        return self.zeros if kind == "zero" else self.poles
+
+    ## Set the points of a root type from its store, the dragged root is left out while it moves
+    def update_roots(self, kind:str):
+        hidden = self.dragged[1] if self.dragged is not None and self.dragged[0] == kind else None
+        self.root_lines[kind].set_data(*self.get_store(kind).points(hidden))
+
     ## Get Zeros
     def get_zeros(self):
-        # Get Zeros
-        zeros = []
-        for zero_obj in self.zeros:
-            # Get Original Object
-            zero = zero_obj.get_original_object()
-            zero_value = zero.get_xdata()[0] + zero.get_ydata()[0] * 1j
-            zeros.append(zero_value)
-            # Get Conjugate Object
-            zero_conj = zero_obj.get_conjugate_object()
-            if zero_conj:
-                zero_conj_value = zero_conj.get_xdata()[0] + zero_conj.get_ydata()[0] * 1j
-                zeros.append(zero_conj_value)
-
-        return zeros + self.allpass
+        return self.zeros.roots().tolist() + self.allpass
 
     ## Get Poles
     def get_poles(self):
         # Get All-Pass
         allpass_conj = [1/np.conjugate(allpass) for allpass in self.allpass]
-        # Get Poles
-        poles = []
-        for pole_obj in self.poles:
-            # Get Original Object
-            pole = pole_obj.get_original_object()
-            pole_value = pole.get_xdata()[0] + pole.get_ydata()[0] * 1j
-            poles.append(pole_value)
-            # Get Conjugate Object
-            pole_conj = pole_obj.get_conjugate_object()
-            if pole_conj:
-                pole_conj_value = pole_conj.get_xdata()[0] + pole_conj.get_ydata()[0] * 1j
-                poles.append(pole_conj_value)
-        
-        return poles + allpass_conj
+        return self.poles.roots().tolist() + allpass_conj
     
     ## Add Zero
     def add_zero(self, z:complex=0+0j, conjugate:bool=False):
-        # Create Z Plane Object
-        zero_obj = Zplane_Object()
-        
-        # Plot The Object
-        zero = self.axes.plot(z.real, z.imag, 'o', markersize=10, alpha=0.9, color='none', markeredgecolor='red', picker=True, pickradius=5)                
-        zero_obj.set_original_object(zero[0])
-        
-        if conjugate:
-            c = np.conj(z)
-            conj = self.axes.plot(c.real, c.imag, 'o', markersize=10, alpha=0.9, color='none', markeredgecolor='red', picker=True, pickradius=5)                
-            zero_obj.set_conjugate_object(conj[0])
-            
-        self.zeros.append(zero_obj)
-        self.draw()
-        self.callback_function()
+        self.zeros.add(z, conjugate)
+        self.update_roots("zero")
+        self.request_draw()
+        self.notify()
 
     ## Add Pole
     def add_pole(self, p:complex=0+0j, conjugate:bool=False):
-        # Create Z Plane Object
-        pole_obj = Zplane_Object()
-
-        # Plot The Object
-        pole = self.axes.plot(p.real, p.imag, 'x', markersize=10, alpha=0.9, color='none', markeredgecolor='blue', picker=True, pickradius=5)
-        pole_obj.set_original_object(pole[0])
-
-        if conjugate:
-            c = np.conj(p)
-            conj = self.axes.plot(c.real, c.imag, 'x', markersize=10, alpha=0.9, color='none', markeredgecolor='blue', picker=True, pickradius=5)
-            pole_obj.set_conjugate_object(conj[0])
-        
-        self.poles.append(pole_obj)
-        self.draw()
-        self.callback_function()
+        self.poles.add(p, conjugate)
+        self.update_roots("pole")
+        self.request_draw()
+        self.notify()
+
+    ## Placed roots of every type: root type -> (values, conjugate flags)
+    def get_roots(self):
+        return {kind: (self.get_store(kind).values, self.get_store(kind).conjugate) for kind in ("zero", "pole")}
+
+    ## Place many roots at once, root type -> (values, conjugate flags), with a single draw & callback
+    def set_roots(self, roots:dict, replace:bool=True):
+        with self.transaction():
+            self.dragged = None
+            for kind in ("zero", "pole"):
+                store = self.get_store(kind)
+                if replace:
+                    store.clear()
+                if kind in roots:
+                    store.extend(*roots[kind])
+                self.update_roots(kind)
+            self.request_draw()
+            self.notify()
 
     ## Add AllPass
     def set_allpass(self, allpass_list:list[complex]):
         self.allpass = allpass_list
-        self.callback_function(False)
+        self.notify(False)
                 
     ## Clear All Zeros  
     def clear_zeros(self):
-        [zero.remove() for zero in self.zeros]
         self.zeros.clear()
-        self.draw()
-        self.callback_function()
+        self.update_roots("zero")
+        self.request_draw()
+        self.notify()
     
     ## Clear All Poles
     def clear_poles(self):
-        [pole.remove() for pole in self.poles]
         self.poles.clear()
-        self.draw()
-        self.callback_function()
+        self.update_roots("pole")
+        self.request_draw()
+        self.notify()
     
     ## Clear All
     def clear_all(self):
-        self.clear_zeros()
-        self.clear_poles()
-        self.callback_function()
+        with self.transaction():
+            self.clear_zeros()
+            self.clear_poles()
+
+    ## Edits made in the block draw & call back once when it ends, transactions can be nested
+    @contextmanager
+    def transaction(self):
+        self.transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self.transaction_depth -= 1
+            if self.transaction_depth == 0:
+                self.end_transaction()
+
+    ## Draw & call back if edits of the transaction asked for it
+    def end_transaction(self):
+        draw, self.pending_draw = self.pending_draw, False
+        callback, self.pending_callback = self.pending_callback, None
+        if draw:
+            scheduler.request_draw(self)
+        if callback is not None:
+            self.callback_function(*callback)
+
+    ## Full redraw on the next tick, or when the transaction ends
+    def request_draw(self):
+        if self.transaction_depth:
+            self.pending_draw = True
+        else:
+            scheduler.request_draw(self)
+
+    ## Call back now, or once when the transaction ends with the arguments of the last call
+    def notify(self, *args):
+        if self.transaction_depth:
+            self.pending_callback = args
+        else:
+            self.callback_function(*args)
 
     # Events        
     def set_events(self):
-        self.mpl_connect("motion_notify_event", self.on_move)
-        self.mpl_connect("pick_event", self.on_pick)
-        self.mpl_connect("motion_notify_event", self.on_move_item)
+        self.mpl_connect("draw_event", self.on_draw)
+        self.mpl_connect("motion_notify_event", self.on_motion)
         self.mpl_connect("button_release_event", self.on_release)
-        self.mpl_connect('button_press_event', self.on_dbl_click)
+        self.mpl_connect('button_press_event', self.on_press)
+
+    # Single motion handler: the first event of a frame is processed right away, the next ones only
+    # replace the pending event which is processed when the frame ends
+    def on_motion(self, event):
+        self.motion_received += 1
+        self.pending_motion = event
+        if not self.motion_timer.isActive():
+            self.process_motion()
+
+    # Process the latest motion event: crosshair, dragged roots & response update
+    def process_motion(self):
+        event, self.pending_motion = self.pending_motion, None
+        if event is None: return
+        self.motion_processed += 1
+        self.on_move(event)
+        self.on_move_item(event)
+        self.motion_timer.start(scheduler.interval)
+
+    # Motion events dropped because a newer one arrived in the same frame
+    def coalesced_motion_events(self) -> int:
+        return self.motion_received - self.motion_processed
 
     # Event when mouse move
     def on_move(self, event):
+        if not self.axis_exist: return
         if not event.inaxes:
             self.set_cross_hair_visible(False)
         else:
@@ -243,99 +303,100 @@ class Zplane(FigureCanvasQTAgg):
             self.vertical_line.set_xdata([x])
             self.i_text.set_text(f"i={x:.2f}")
             self.j_text.set_text(f"j={y:.2f}")
-        self.draw_idle()
-        self.blit()
-
-    # Event when object picking
-    def on_pick(self, event:PickEvent):
-        self.dragged = event.artist
-        self.dragged.set_markeredgecolor("black")
-        self.axes.draw_artist(self.dragged)
-
-        self.dragged_conjugate = self.get_obj_conj(self.dragged)    
-        if self.dragged_conjugate:
-            self.dragged_conjugate.set_markeredgecolor("green")
-            self.axes.draw_artist(self.dragged_conjugate)
+        scheduler.request_blit(self, self.blit_animated)
+
+    # Event when mouse pressing: double click removes roots, a click on a root starts dragging it
+    def on_press(self, event):
+        if event.xdata is None or event.ydata is None: return
+        if event.dblclick:
+            self.on_dbl_click(event)
+            return
+
+        hit = self.hit_test(complex(event.xdata, event.ydata))
+        if hit is None: return
+        kind, i, is_conjugate = hit
+        self.dragged = hit
+
+        marker = self.root_lines[kind].get_marker()
+        self.dragged_line.set_marker(marker)
+        self.dragged_conjugate_line.set_marker(marker)
+        self.update_dragged()
+        self.update_roots(kind)
+
+        # Background without the dragged roots
+        self.request_draw()
+
+    ## Nearest root (or conjugate) point around a position, as kind, id & is conjugate
+    def hit_test(self, point:complex):
+        hits = []
+        for kind in ("zero", "pole"):
+            store = self.get_store(kind)
+            ids, is_conjugate = store.query(point, self.hit_radius)
+            if len(ids):
+                i, conjugate = int(ids[0]), bool(is_conjugate[0])
+                position = store.value(i).conjugate() if conjugate else store.value(i)
+                hits.append((abs(position - point), (kind, i, conjugate)))
+        return min(hits)[1] if hits else None
+
+    ## Points of the dragged root (where the mouse is) & of its conjugate
+    def update_dragged(self):
+        kind, i, is_conjugate = self.dragged
+        store = self.get_store(kind)
+        root = store.value(i).conjugate() if is_conjugate else store.value(i)
+        self.dragged_line.set_data([root.real], [root.imag])
+        if store.has_conjugate(i):
+            self.dragged_conjugate_line.set_data([root.real], [-root.imag])
+        else:
+            self.dragged_conjugate_line.set_data([], [])
     
     # Event when item moving
     def on_move_item(self, event):
         if self.dragged is None: return
-                      
-        # New Position
-        new_x = event.xdata 
-        new_y = event.ydata
-        
-        self.dragged.set_xdata(new_x)
-        self.dragged.set_ydata(new_y)
-
-        self.axes.draw_artist(self.dragged)
+        if event.xdata is None or event.ydata is None: return
 
-        if self.dragged_conjugate:
-            self.dragged_conjugate.set_xdata(new_x)
-            self.dragged_conjugate.set_ydata(-new_y)
-            self.axes.draw_artist(self.dragged_conjugate)
+        # New Position, dragging a conjugate point moves its root to the mirrored position
+        kind, i, is_conjugate = self.dragged
+        root = complex(event.xdata, event.ydata)
+        self.get_store(kind).move(i, np.conj(root) if is_conjugate else root)
+        self.update_dragged()
         
-        # self.callback_function()
+        scheduler.request_blit(self, self.blit_animated)
+        self.notify()
 
     # Event when mouse releasing
     def on_release(self, event):
         if self.dragged is None: return
-
-        # Original Color of dragged item
-        if self.dragged.get_marker() == "o":
-            self.dragged.set_markeredgecolor("red")
-        else:
-            self.dragged.set_markeredgecolor("blue")
-        self.axes.draw_artist(self.dragged)
-        
-        # Original Color of dragged item
-        if self.dragged_conjugate:
-            if self.dragged_conjugate.get_marker() == "o":
-                self.dragged_conjugate.set_markeredgecolor("red")
-            else:
-                self.dragged_conjugate.set_markeredgecolor("blue")
-            self.axes.draw_artist(self.dragged_conjugate)
-                
-        self.callback_function()
-        self.dragged = None
-        self.dragged_conjugate = None
-
-    # Event when double click
+        # One callback for the release, the flushed move does not call back on its own
+        with self.transaction():
+            self.process_motion() # The root is dropped at the last position
+
+            # Dropped roots are part of the background again
+            kind = self.dragged[0]
+            self.dragged = None
+            self.update_roots(kind)
+            self.request_draw()
+            self.notify()
+
+    # Event when double click, the roots whose point (or conjugate point) is in the clicked region are removed
     def on_dbl_click(self, event):
-        if event.dblclick:
-            r = 0.045
-            for i, zero_obj in enumerate(self.zeros):
-                zero = zero_obj.get_original_object()
-                is_in_zero_region = self.in_region(zero.get_xdata()[0], zero.get_ydata()[0], r, event)
-
-                zero_conj = zero_obj.get_conjugate_object()
-                if zero_conj:
-                    is_in_zero_conj_region = self.in_region(zero_conj.get_xdata()[0], zero_conj.get_ydata()[0], r, event)
-                else:
-                    is_in_zero_conj_region = False
-                    
-                if is_in_zero_region or is_in_zero_conj_region:
-                    zero_obj.remove()
-                    self.zeros.pop(i)
-
-            for i, pole_obj in enumerate(self.poles):
-                pole = pole_obj.get_original_object()
-                is_in_pole_region = self.in_region(pole.get_xdata()[0], pole.get_ydata()[0], r, event)
-
-                pole_conj = pole_obj.get_conjugate_object()
-                if pole_conj:
-                    is_in_pole_conj_region = self.in_region(pole_conj.get_xdata()[0], pole_conj.get_ydata()[0], r, event)
-                else:
-                    is_in_pole_conj_region = False
-                    
-                if is_in_pole_region or is_in_pole_conj_region:
-                    pole_obj.remove()
-                    self.poles.pop(i)
-
-        self.draw_idle()
-        self.blit()
-        self.callback_function()
+        # The first press of the double click started dragging the root, it is dropped
+        dragged, self.dragged = self.dragged, None
+        point = complex(event.xdata, event.ydata)
+        removed = False
+        for kind in ("zero", "pole"):
+            store = self.get_store(kind)
+            ids = np.unique(store.query(point, self.hit_radius)[0])
+            if len(ids):
+                store.remove(ids)
+                removed = True
+
+        if removed or dragged is not None:
+            self.update_roots("zero")
+            self.update_roots("pole")
+            self.request_draw()
+        if removed:
+            self.notify()
     
     # When callback is none
-    def none_function(self):
+    def none_function(self, *args):
         pass
\ No newline at end of file